@@ -0,0 +1,105 @@
+"""
+Time the conversion of python types to TypeScript, per converted node.
+
+    python benchmarks/converter.py [--depth N] [--repeat N]
+
+Each case is converted `repeat` times with `py_type_to_ts_string` and the
+best time is reported, divided by the number of nodes of the type: every
+nested type, class property included, is one node. The deep cases go past the
+recursion limit with `--depth`, which a recursive converter can't do.
+
+Inline classes have their own `--class-depth`: every level indents all the
+levels inside it, so the output grows with the square of the depth.
+"""
+import argparse
+import dataclasses
+import sys
+import time
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+sys.path.insert(0, ".")
+
+from py_writes_ts.class_to_interface import py_type_to_ts_string  # noqa: E402
+
+
+def nested_lists(depth: int) -> Any:
+    # types.GenericAlias, typing's cache would hash the whole nesting
+    py_type: Any = int
+    for _ in range(depth):
+        py_type = list[py_type]
+    return py_type
+
+
+def nested_dicts(depth: int) -> Any:
+    py_type: Any = str
+    for _ in range(depth):
+        py_type = dict[str, tuple[py_type, int]]
+    return py_type
+
+
+def nested_classes(depth: int) -> Any:
+    py_type: Any = int
+    for level in range(depth):
+        py_type = dataclasses.make_dataclass(f"Level{level}", [("name", str), ("child", py_type)])
+    return py_type
+
+
+def wide_class(width: int) -> Any:
+    @dataclasses.dataclass
+    class Address:
+        street: str
+        country: Literal["ES", "FR", "PT"]
+
+    field_types = [int, Optional[str], List[Address], Dict[str, List[float]], Tuple[int, str]]
+    fields = [(f"field{index}", field_types[index % len(field_types)]) for index in range(width)]
+    return dataclasses.make_dataclass("Wide", fields)
+
+
+def count_nodes(py_type: Any) -> int:
+    nodes, stack = 0, [py_type]
+    while stack:
+        current = stack.pop()
+        nodes += 1
+        if dataclasses.is_dataclass(current):
+            stack.extend(field.type for field in dataclasses.fields(current))
+        elif getattr(current, "__origin__", None) is not Literal:
+            stack.extend(getattr(current, "__args__", ()))
+    return nodes
+
+
+def measure(build: Callable[[], Any], repeat: int) -> Tuple[int, float]:
+    py_type = build()
+    nodes = count_nodes(py_type)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        py_type_to_ts_string(py_type, [])
+        best = min(best, time.perf_counter() - start)
+    return nodes, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=200, help="nesting of the deep cases (default: 200)")
+    parser.add_argument("--class-depth", type=int, default=200, help="nesting of the inline classes case (default: 200)")
+    parser.add_argument("--repeat", type=int, default=20, help="conversions per case (default: 20)")
+    args = parser.parse_args()
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "wide class": lambda: wide_class(1000),
+        f"nested lists ({args.depth})": lambda: nested_lists(args.depth),
+        f"nested dicts ({args.depth})": lambda: nested_dicts(args.depth),
+        f"nested classes ({args.class_depth})": lambda: nested_classes(args.class_depth),
+    }
+    print(f"{'case':<24}  {'nodes':>7}  {'total':>9}  {'per node':>9}")
+    for name, build in cases.items():
+        try:
+            nodes, seconds = measure(build, args.repeat)
+        except RecursionError:
+            print(f"{name:<24}  RecursionError")
+            continue
+        print(f"{name:<24}  {nodes:>7}  {seconds * 1000:>7.2f}ms  {seconds / nodes * 1e6:>7.3f}us")
+
+
+if __name__ == "__main__":
+    main()
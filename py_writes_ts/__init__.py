@@ -1,4 +1,9 @@
-from .class_to_interface import generate_typescript_interfaces, ts_name
+from .class_to_interface import generate_typescript_interfaces, ts_name, py_type_to_ts_string, register_converter, unregister_converter, ConversionContext
 from .rename_interfaces import rename_interfaces
-from .import_generator import generate_typescript_import
-from .function_generator import generate_typescript_function
\ No newline at end of file
+from .import_generator import generate_typescript_import, generate_typescript_type_import, generate_typescript_export
+from .function_generator import generate_typescript_function
+from .dependency_graph import DependencyGraph, build_dependency_graph, reachable_models
+from .naming import NamingPolicy
+from .type_aliases import find_type_aliases
+from .manifest import export_manifest, load_manifest, render_manifest
+from .symbols import SymbolTable
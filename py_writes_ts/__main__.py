@@ -0,0 +1,5 @@
+import sys
+
+from py_writes_ts.cli import main
+
+sys.exit(main())
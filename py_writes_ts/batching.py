@@ -0,0 +1,175 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from py_writes_ts.class_to_interface import py_type_to_ts_string, ts_name
+from py_writes_ts.function_generator import Endpoint, generate_typescript_function
+from py_writes_ts.json_values import from_json, to_json
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+
+logger = logging.getLogger(__name__)
+
+
+def generate_batching_client(
+    endpoints: List[Endpoint],
+    valid_refs: List[type] = [],
+    batch_path: str = "/api/batch",
+    max_batch_size: int = 50,
+    naming: Optional[NamingPolicy] = None,
+    symbols: Optional[SymbolTable] = None,
+) -> str:
+    """
+    Generate a TypeScript client whose endpoint functions don't call their
+    endpoints directly: the calls made in the same microtask are sent together
+    in a single request to the batch endpoint, and each caller gets its own
+    typed result back. Serve the batch endpoint with a `BatchDispatcher`.
+
+    :param endpoints: The endpoints to generate functions for.
+    :param valid_refs: Classes that can be referenced by their interface name.
+    :param batch_path: URL of the batch endpoint.
+    :param max_batch_size: A batch is sent as soon as it has this many calls.
+    :param naming: Naming policy for the referenced interfaces.
+    :param symbols: Symbol table the interfaces were named with, see
+                    `generate_typescript_interfaces`.
+    :return: The TypeScript code of the client.
+    """
+    code = f"""type BatchCall = {{
+    endpoint: string;
+    params: unknown;
+    resolve: (data: any) => void;
+    reject: (error: unknown) => void;
+}};
+
+type BatchResult = {{ data: unknown }} | {{ error: string }};
+
+let pendingCalls: BatchCall[] = [];
+
+function flushBatch(): void {{
+    const calls = pendingCalls;
+    pendingCalls = [];
+    if (calls.length === 0) {{
+        return;
+    }}
+    fetch(`{batch_path}`, {{
+        method: "POST",
+        headers: {{
+            "Content-Type": "application/json"
+        }},
+        body: JSON.stringify(calls.map(call => ({{ endpoint: call.endpoint, params: call.params }})))
+    }}).then(async response => {{
+        if (!response.ok) {{
+            throw new Error(`API call failed with status ${{response.status}}`);
+        }}
+        const results: BatchResult[] = await response.json();
+        calls.forEach((call, index) => {{
+            const result = results[index];
+            if (result === undefined) {{
+                call.reject(new Error("The batch response has no result for this call"));
+            }} else if ("error" in result) {{
+                call.reject(new Error(result.error));
+            }} else {{
+                call.resolve(result.data);
+            }}
+        }});
+    }}).catch(error => calls.forEach(call => call.reject(error)));
+}}
+
+function batchCall<T>(endpoint: string, params: unknown): Promise<T> {{
+    return new Promise<T>((resolve, reject) => {{
+        if (pendingCalls.length === 0) {{
+            queueMicrotask(flushBatch);
+        }}
+        pendingCalls.push({{ endpoint, params, resolve, reject }});
+        if (pendingCalls.length >= {max_batch_size}) {{
+            flushBatch();
+        }}
+    }});
+}}
+
+"""
+    valid_ref_names = {ts_name(ref, naming, symbols) for ref in valid_refs}
+    for endpoint in endpoints:
+        response_ts = py_type_to_ts_string(endpoint.response_type, valid_ref_names, naming=naming, symbols=symbols)
+        code += generate_typescript_function(
+            function_name=endpoint.name,
+            parameters={"params": endpoint.request_type},
+            return_type=f"Promise<{response_ts}>",
+            body=f'return batchCall<{response_ts}>("{endpoint.path}", params);',
+            valid_refs=valid_refs,
+            naming=naming,
+            symbols=symbols,
+        )
+    return code
+
+
+class BatchCallError(Exception):
+    """
+    Raise it from a handler to fail its call with the message of the error.
+    Other exceptions are logged and the call fails with a generic message,
+    so their details don't reach the client.
+    """
+
+
+class BatchDispatcher:
+    """
+    Python side of `generate_batching_client`: runs the calls of a batch
+    request with the handler of each endpoint and collects their results in
+    the same order.
+
+    Handlers receive an instance of the request type of their endpoint, built
+    from the JSON parameters, and return the response. A failing call doesn't
+    fail the rest of the batch, it gets an error result instead, see
+    `BatchCallError`.
+
+    :param max_batch_size: Batches with more calls are rejected.
+    """
+
+    def __init__(self, max_batch_size: int = 50) -> None:
+        self.max_batch_size = max_batch_size
+        self._routes: Dict[str, Tuple[Endpoint, Callable[[Any], Any]]] = {}
+
+    def register(self, endpoint: Endpoint, handler: Callable[[Any], Any]) -> None:
+        """
+        Handle the calls to an endpoint with a function.
+        """
+        self._routes[endpoint.path] = (endpoint, handler)
+
+    def route(self, endpoint: Endpoint) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+        """
+        Decorator version of `register`.
+        """
+        def decorator(handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+            self.register(endpoint, handler)
+            return handler
+        return decorator
+
+    def dispatch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run a batch.
+
+        :param calls: The decoded JSON body of the batch request, a list of
+                      `{"endpoint": path, "params": ...}`.
+        :return: The JSON body of the response, a list with a
+                 `{"data": ...}` or an `{"error": message}` for each call.
+        """
+        if len(calls) > self.max_batch_size:
+            raise ValueError(f"A batch can't have more than {self.max_batch_size} calls, it has {len(calls)}.")
+        results: List[Dict[str, Any]] = []
+        for call in calls:
+            path = call.get("endpoint")
+            route = self._routes.get(path) if isinstance(path, str) else None
+            if route is None:
+                results.append({"error": f"Unknown endpoint: {path}"})
+                continue
+            endpoint, handler = route
+            try:
+                data = handler(from_json(endpoint.request_type, call.get("params")))
+            except BatchCallError as error:
+                results.append({"error": str(error)})
+                continue
+            except Exception:
+                logger.exception("Batched call to %s failed", path)
+                results.append({"error": "Internal error"})
+                continue
+            results.append({"data": to_json(data)})
+        return results
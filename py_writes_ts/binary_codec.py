@@ -0,0 +1,409 @@
+"""
+Compact binary wire format, for numeric-heavy responses where JSON encoding
+and decoding dominate. The layout is derived from the types, so nothing but
+the values is sent, and both sides are generated from the same type graph:
+`encode` writes it in python and `generate_typescript_decoders` writes the
+TypeScript functions that read it. JSON remains the default, use this for the
+endpoints that need it.
+
+Layout, little endian, fields in declaration order:
+
+- bool: 1 byte.
+- int and float: float64, which is what a TypeScript number is.
+- str, and Literal of strings: uint32 byte length and the UTF-8 bytes.
+- Optional[T]: 1 byte (0 for None) followed by T if it isn't None.
+- List[int] and List[float]: uint32 count, padding up to a multiple of 8 bytes
+  from the start of the message, and the float64 values. TypeScript reads them
+  as a Float64Array over the received buffer, without copying.
+- List[T]: uint32 count and the items.
+- Classes: their fields, one after another.
+"""
+import struct
+import sys
+import types
+from array import array
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union, get_args, get_origin
+
+from py_writes_ts.dependency_graph import is_model, model_properties
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+from py_writes_ts.class_to_interface import ts_name
+
+Encoder = Callable[[bytearray, Any], None]
+Decoder = Callable[[bytes, int], Tuple[Any, int]]
+
+_BOOL = struct.Struct("<B")
+_NUMBER = struct.Struct("<d")
+_COUNT = struct.Struct("<I")
+_NATIVE_IS_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _optional_arg(py_type: Any) -> Optional[Any]:
+    """
+    Returns T for Optional[T], None for anything else.
+    """
+    if get_origin(py_type) in (Union, types.UnionType):
+        args = [arg for arg in get_args(py_type) if arg is not type(None)]
+        if len(args) == 1 and len(get_args(py_type)) == 2:
+            return args[0]
+    return None
+
+
+def _is_number(py_type: Any) -> bool:
+    return py_type in (int, float)
+
+
+def _is_string(py_type: Any) -> bool:
+    if py_type is str:
+        return True
+    return get_origin(py_type) is Literal and all(isinstance(arg, str) for arg in get_args(py_type))
+
+
+def _unsupported(py_type: Any) -> TypeError:
+    return TypeError(f"{py_type!r} can't be sent in the binary format.")
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(bytes(-len(buffer) % 8))
+
+
+def _encode_bool(buffer: bytearray, value: Any) -> None:
+    buffer.extend(_BOOL.pack(1 if value else 0))
+
+
+def _decode_bool(data: bytes, offset: int) -> Tuple[Any, int]:
+    return data[offset] != 0, offset + 1
+
+
+def _encode_number(buffer: bytearray, value: Any) -> None:
+    buffer.extend(_NUMBER.pack(value))
+
+
+def _decode_float(data: bytes, offset: int) -> Tuple[Any, int]:
+    return _NUMBER.unpack_from(data, offset)[0], offset + 8
+
+
+def _decode_int(data: bytes, offset: int) -> Tuple[Any, int]:
+    return int(_NUMBER.unpack_from(data, offset)[0]), offset + 8
+
+
+def _encode_string(buffer: bytearray, value: Any) -> None:
+    encoded = value.encode()
+    buffer.extend(_COUNT.pack(len(encoded)))
+    buffer.extend(encoded)
+
+
+def _decode_string(data: bytes, offset: int) -> Tuple[Any, int]:
+    (length,) = _COUNT.unpack_from(data, offset)
+    offset += 4
+    return bytes(data[offset:offset + length]).decode(), offset + length
+
+
+def _encode_numbers(buffer: bytearray, value: Any) -> None:
+    values = array("d", value)
+    if _NATIVE_IS_BIG_ENDIAN:
+        values.byteswap()
+    buffer.extend(_COUNT.pack(len(values)))
+    _pad(buffer)
+    buffer.extend(values.tobytes())
+
+
+def _numbers_decoder(item_type: Any) -> Decoder:
+    def decode(data: bytes, offset: int) -> Tuple[Any, int]:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += 4
+        offset += -offset % 8
+        values = array("d")
+        values.frombytes(data[offset:offset + count * 8])
+        if _NATIVE_IS_BIG_ENDIAN:
+            values.byteswap()
+        items = values.tolist()
+        if item_type is int:
+            items = [int(item) for item in items]
+        return items, offset + count * 8
+    return decode
+
+
+class BinaryCodec:
+    """
+    Encodes and decodes python values of some types in the binary format.
+    The encoder and decoder of each type are built the first time it is used.
+    """
+
+    def __init__(self) -> None:
+        self._encoders: Dict[Any, Encoder] = {}
+        self._decoders: Dict[Any, Decoder] = {}
+
+    def encode(self, value: Any, py_type: Any) -> bytes:
+        """
+        Encode a value of a type.
+        """
+        buffer = bytearray()
+        self.encoder(py_type)(buffer, value)
+        return bytes(buffer)
+
+    def decode(self, data: bytes, py_type: Any) -> Any:
+        """
+        Decode a value of a type. Classes are built by calling them with their
+        fields as keyword arguments.
+        """
+        value, _ = self.decoder(py_type)(data, 0)
+        return value
+
+    def encoder(self, py_type: Any) -> Encoder:
+        encoder = self._encoders.get(py_type)
+        if encoder is None:
+            encoder = self._encoders[py_type] = self._build_encoder(py_type)
+        return encoder
+
+    def decoder(self, py_type: Any) -> Decoder:
+        decoder = self._decoders.get(py_type)
+        if decoder is None:
+            decoder = self._decoders[py_type] = self._build_decoder(py_type)
+        return decoder
+
+    def _build_encoder(self, py_type: Any) -> Encoder:
+        if py_type is bool:
+            return _encode_bool
+        if _is_number(py_type):
+            return _encode_number
+        if _is_string(py_type):
+            return _encode_string
+        optional_arg = _optional_arg(py_type)
+        if optional_arg is not None:
+            encode_arg = self.encoder(optional_arg)
+
+            def encode_optional(buffer: bytearray, value: Any) -> None:
+                if value is None:
+                    buffer.append(0)
+                else:
+                    buffer.append(1)
+                    encode_arg(buffer, value)
+            return encode_optional
+        if get_origin(py_type) is list:
+            (item_type,) = get_args(py_type)
+            if _is_number(item_type):
+                return _encode_numbers
+            encode_item = self.encoder(item_type)
+
+            def encode_list(buffer: bytearray, value: Any) -> None:
+                buffer.extend(_COUNT.pack(len(value)))
+                for item in value:
+                    encode_item(buffer, item)
+            return encode_list
+        if is_model(py_type):
+            # looked up when called, so models can reference themselves
+            fields = [(name, field_type) for name, field_type in model_properties(py_type).items()]
+
+            def encode_model(buffer: bytearray, value: Any) -> None:
+                for name, field_type in fields:
+                    self.encoder(field_type)(buffer, getattr(value, name))
+            return encode_model
+        raise _unsupported(py_type)
+
+    def _build_decoder(self, py_type: Any) -> Decoder:
+        if py_type is bool:
+            return _decode_bool
+        if py_type is int:
+            return _decode_int
+        if py_type is float:
+            return _decode_float
+        if _is_string(py_type):
+            return _decode_string
+        optional_arg = _optional_arg(py_type)
+        if optional_arg is not None:
+            decode_arg = self.decoder(optional_arg)
+
+            def decode_optional(data: bytes, offset: int) -> Tuple[Any, int]:
+                if data[offset] == 0:
+                    return None, offset + 1
+                return decode_arg(data, offset + 1)
+            return decode_optional
+        if get_origin(py_type) is list:
+            (item_type,) = get_args(py_type)
+            if _is_number(item_type):
+                return _numbers_decoder(item_type)
+            decode_item = self.decoder(item_type)
+
+            def decode_list(data: bytes, offset: int) -> Tuple[Any, int]:
+                (count,) = _COUNT.unpack_from(data, offset)
+                offset += 4
+                items = []
+                for _ in range(count):
+                    item, offset = decode_item(data, offset)
+                    items.append(item)
+                return items, offset
+            return decode_list
+        if is_model(py_type):
+            fields = [(name, field_type) for name, field_type in model_properties(py_type).items()]
+            cls = get_origin(py_type) or py_type
+
+            def decode_model(data: bytes, offset: int) -> Tuple[Any, int]:
+                values = {}
+                for name, field_type in fields:
+                    values[name], offset = self.decoder(field_type)(data, offset)
+                return cls(**values), offset
+            return decode_model
+        raise _unsupported(py_type)
+
+
+_default_codec = BinaryCodec()
+
+
+def encode(value: Any, py_type: Any) -> bytes:
+    """
+    Encode a value in the binary format.
+
+    :param value: The value, for example a dataclass instance.
+    :param py_type: Its type, which decides the layout.
+    :return: The encoded bytes.
+    """
+    return _default_codec.encode(value, py_type)
+
+
+def decode(data: bytes, py_type: Any) -> Any:
+    """
+    Decode a value from the binary format.
+
+    :param data: The encoded bytes.
+    :param py_type: The type of the value.
+    :return: The value.
+    """
+    return _default_codec.decode(data, py_type)
+
+
+_TYPESCRIPT_READER = """export type Binary<T> =
+    T extends string ? string :
+    T extends number[] ? Float64Array :
+    T extends (infer Item)[] ? Binary<Item>[] :
+    T extends object ? { [K in keyof T]: Binary<T[K]> } :
+    T;
+
+const textDecoder = new TextDecoder();
+
+export class BinaryReader {
+    private bytes: Uint8Array;
+    private view: DataView;
+    private offset = 0;
+
+    constructor(bytes: Uint8Array) {
+        this.bytes = bytes;
+        this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    }
+
+    bool(): boolean {
+        return this.view.getUint8(this.offset++) !== 0;
+    }
+
+    number(): number {
+        const value = this.view.getFloat64(this.offset, true);
+        this.offset += 8;
+        return value;
+    }
+
+    count(): number {
+        const value = this.view.getUint32(this.offset, true);
+        this.offset += 4;
+        return value;
+    }
+
+    string(): string {
+        const length = this.count();
+        const value = textDecoder.decode(this.bytes.subarray(this.offset, this.offset + length));
+        this.offset += length;
+        return value;
+    }
+
+    numbers(): Float64Array {
+        const count = this.count();
+        this.offset += (8 - this.offset % 8) % 8;
+        const start = this.offset;
+        this.offset += count * 8;
+        if ((this.bytes.byteOffset + start) % 8 === 0) {
+            // no copy, a view over the received bytes
+            return new Float64Array(this.bytes.buffer, this.bytes.byteOffset + start, count);
+        }
+        return new Float64Array(this.bytes.slice(start, this.offset).buffer);
+    }
+
+    list<T>(readItem: () => T): T[] {
+        const count = this.count();
+        const items: T[] = new Array(count);
+        for (let i = 0; i < count; i++) {
+            items[i] = readItem();
+        }
+        return items;
+    }
+}
+
+"""
+
+INDENTATION = "    "
+
+
+def _ts_read_expression(py_type: Any, decoder_names: Dict[Any, str], indent: int, inlining: Tuple[Any, ...]) -> str:
+    if py_type is bool:
+        return "reader.bool()"
+    if _is_number(py_type):
+        return "reader.number()"
+    if _is_string(py_type):
+        return "reader.string()"
+    optional_arg = _optional_arg(py_type)
+    if optional_arg is not None:
+        return f"reader.bool() ? {_ts_read_expression(optional_arg, decoder_names, indent, inlining)} : null"
+    if get_origin(py_type) is list:
+        (item_type,) = get_args(py_type)
+        if _is_number(item_type):
+            return "reader.numbers()"
+        item_expression = _ts_read_expression(item_type, decoder_names, indent, inlining)
+        if item_expression.startswith("{"):
+            # an arrow function returning an object literal needs parentheses
+            item_expression = f"({item_expression})"
+        return f"reader.list(() => {item_expression})"
+    if is_model(py_type):
+        if py_type in decoder_names:
+            return f"{decoder_names[py_type]}(reader)"
+        if py_type in inlining:
+            names = " -> ".join(ts_name(model) for model in (*inlining[inlining.index(py_type):], py_type))
+            raise ValueError(f"{ts_name(py_type)} references itself ({names}), so it can't be read inline. Add it to py_types.")
+        return _ts_read_object(py_type, decoder_names, indent, inlining)
+    raise _unsupported(py_type)
+
+
+def _ts_read_object(py_type: Any, decoder_names: Dict[Any, str], indent: int, inlining: Tuple[Any, ...] = ()) -> str:
+    # inlining: the models being read inline around this one
+    next_indent = INDENTATION * (indent + 1)
+    fields = "".join(
+        f"{next_indent}{name}: {_ts_read_expression(field_type, decoder_names, indent + 1, (*inlining, py_type))},\n"
+        for name, field_type in model_properties(py_type).items()
+    )
+    return f"{{\n{fields}{INDENTATION * indent}}}"
+
+
+def generate_typescript_decoders(py_types: List[Any], naming: Optional[NamingPolicy] = None, symbols: Optional[SymbolTable] = None) -> str:
+    """
+    Generate the TypeScript code that reads the binary format: a `BinaryReader`
+    and a `decodeName(reader)` function for each class. They return
+    `Binary<Name>`, the interface `Name` with its number lists as Float64Array
+    and its literals of strings as strings, which the decoders don't check. The
+    interfaces must be generated too, with the same naming policy.
+
+        const reader = new BinaryReader(new Uint8Array(await response.arrayBuffer()));
+        const room = decodeRoom(reader);
+
+    :param py_types: The classes to generate decoders for. Classes they
+                     reference that aren't in the list are read inline.
+    :param naming: Naming policy used for the interfaces.
+    :param symbols: Symbol table the interfaces were named with.
+    :return: The TypeScript code.
+    :raises ValueError: If a class read inline contains itself.
+    """
+    decoder_names = {py_type: f"decode{ts_name(py_type, naming, symbols)}" for py_type in py_types}
+    code = _TYPESCRIPT_READER
+    for py_type, decoder_name in decoder_names.items():
+        code += f"""export function {decoder_name}(reader: BinaryReader): Binary<{ts_name(py_type, naming, symbols)}> {{
+{INDENTATION}return {_ts_read_object(py_type, decoder_names, 1)};
+}}
+
+"""
+    return code
@@ -1,26 +1,278 @@
-from typing import Literal, Type, List, Dict, Any, Union, get_type_hints, get_origin, Generic
-from typing import Type, get_origin, get_args
+import collections.abc
+import datetime
+import decimal
+import enum
+import functools
+import json
+import types
+import typing
+import uuid
+from dataclasses import dataclass, field
+from typing import AbstractSet, Annotated, Any, Callable, Collection, Dict, Generator, List, Literal, Optional, Set, Tuple, Type, Union, get_args, get_origin, get_type_hints
 
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
 
-def _primitive_to_ts(py_type: Union[Type, str]) -> str:
+
+INDENTATION = "    "
+
+ConverterSteps = Generator[Tuple[Any, int], str, str]
+
+Converter = Callable[[Any, "ConversionContext", int], Union[str, ConverterSteps]]
+"""
+A converter receives the python type to translate, the conversion context and
+the current indentation level, and returns the TypeScript code for the type.
+Converters translate nested types by calling `context.convert(nested, indent)`.
+
+A converter can also be a generator that yields `(nested, indent)` for each
+nested type, receives its TypeScript code back and returns its own:
+
+    def convert_box(py_type, context, indent):
+        item = yield get_args(py_type)[0], indent
+        return f"Box<{item}>"
+
+Nested types are then converted from an explicit stack instead of python
+recursion, so no nesting depth runs into the recursion limit. The built-in
+converters work this way.
+"""
+
+_CONVERTERS: Dict[Any, Converter] = {}
+
+# keys of the converters that translate parametrized containers, which
+# don't handle the subclasses that have properties of their own
+_CONTAINERS: Set[Any] = set()
+
+# the converter found for each class by `get_converter`, None included
+_RESOLVED: Dict[type, Optional[Converter]] = {}
+
+# `type X = ...` statements create TypeAliasType objects, typing_extensions
+# backports them to older python versions with a class of its own
+_TYPE_ALIAS_TYPES: Tuple[type, ...] = (typing.TypeAliasType,) if hasattr(typing, "TypeAliasType") else ()
+try:
+    import typing_extensions
+except ImportError:
+    pass
+else:
+    if typing_extensions.TypeAliasType not in _TYPE_ALIAS_TYPES:
+        _TYPE_ALIAS_TYPES += (typing_extensions.TypeAliasType,)
+
+
+@dataclass
+class ConversionContext:
     """
-    Translate a primitive Python type or a string to its TypeScript equivalent.
+    State shared by all the converters during a conversion.
+
+    :param allowed_refs: TypeScript names of the interfaces that can be
+                         referenced by name instead of being written inline.
+    :param literal_alias_threshold: Literal types with at least this many values
+                                    are declared once as a named type and
+                                    referenced by that name. None never does it.
+    :param literal_style: How named literal types are declared: "union" writes
+                          `type Name = 'a' | 'b'`, "const_array" writes a
+                          `NameValues` array `as const` and derives the type from it.
+    :param literal_names: Names for specific Literal types. Other named literal
+                          types are named after the class and property using them.
+    :param declarations: TypeScript declarations, such as named literal types,
+                         collected during the conversion, by name.
+    :param declared_names: Name given to each type in `declarations`.
+    :param name_hint: Suggested name for the type being converted, set while
+                      converting a class property.
+    :param naming: Naming policy for the TypeScript names of the python types.
+    :param enum_style: How Enum classes are declared, once, to be referenced by
+                       name: "const_enum" writes a `const enum`, inlined by the
+                       TypeScript compiler, "union" a union of the values and
+                       "const_object" an object `as const` plus a type with the
+                       same name. None writes the union of the values inline.
+    :param type_aliases: Names of python types that are written as a named
+                         TypeScript type, like `UserList = List[User]`.
+    :param declare_aliases: Declare type aliases, the ones in `type_aliases`
+                            and the ones made with `type X = ...`, once as
+                            `export type X = ...` and reference them by name.
+                            Otherwise they are written inline unless their
+                            name is in `allowed_refs`.
+    :param declaration_refs: Names that declarations can reference, when they
+                             are not the same as `allowed_refs`.
+    :param symbols: Names given to the types that are declared or referenced
+                    by name, which keeps two types from sharing a name. Types
+                    it hasn't named can't be referenced. Without it, names only
+                    follow the naming policy.
+    :param ts_types: TypeScript code for specific python types, written
+                     instead of what their converters would write.
+    :param reserved_names: Names taken by the interfaces of the output, which
+                           declarations can't have.
     """
-    if isinstance(py_type, str):
-        # If the type is already a string, return it as-is
-        return py_type
+    allowed_refs: Collection[str] = ()
+    literal_alias_threshold: Optional[int] = None
+    literal_style: Literal["union", "const_array"] = "union"
+    literal_names: Dict[Any, str] = field(default_factory=dict)
+    declarations: Dict[str, str] = field(default_factory=dict)
+    declared_names: Dict[Any, str] = field(default_factory=dict)
+    name_hint: Optional[str] = None
+    naming: Optional[NamingPolicy] = None
+    enum_style: Optional[Literal["const_enum", "union", "const_object"]] = None
+    type_aliases: Dict[Any, str] = field(default_factory=dict)
+    declare_aliases: bool = False
+    declaration_refs: Optional[Collection[str]] = None
+    symbols: Optional[SymbolTable] = None
+    ts_types: Dict[Any, str] = field(default_factory=dict)
+    reserved_names: Collection[str] = ()
+    _properties: Dict[Any, Dict[str, Any]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # the classes being written inline, in order, to find the ones that contain themselves
+    _inlining: Dict[Any, None] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def convert(self, py_type: Any, indent: int = 0) -> str:
+        """
+        Convert a nested type using this same context.
+        """
+        return _convert(py_type, self, indent)
+
+    def ts_name(self, py_type: Any) -> str:
+        """
+        Returns the TypeScript name of a python type that is declared or
+        referenced by name, following the naming policy.
+        """
+        return ts_name(py_type, self.naming, self.symbols)
+
+    def reference(self, py_type: Any) -> Optional[str]:
+        """
+        Returns the name a python type is referenced by if it is one of
+        `allowed_refs`, or None if it has to be written inline.
+        """
+        if self.symbols is not None:
+            # a type the table hasn't named doesn't have an interface
+            name = self.symbols.get(py_type)
+        else:
+            name = ts_name(py_type, self.naming)
+        return name if name is not None and name in self.allowed_refs else None
+
+    def properties(self, py_type: Any) -> Dict[str, Any]:
+        """
+        Returns the resolved type hints of a class or a parametrized generic,
+        resolved once per conversion.
+        """
+        properties = self._properties.get(py_type)
+        if properties is None:
+            if get_origin(py_type) is not None:
+                properties = _parametrized_generic_properties(py_type)
+            else:
+                properties = get_type_hints(py_type)
+            self._properties[py_type] = properties
+        return properties
+
+    def declare(self, py_type: Any, name: str, render: Callable[[str], str]) -> str:
+        """
+        Declare a named TypeScript type for a python type, once per conversion.
+
+        If the name is already taken by another declaration or an interface a
+        numeric suffix is added.
+
+        :param py_type: The python type being declared.
+        :param name: The preferred TypeScript name.
+        :param render: Function that receives the final name and returns the declaration.
+        :return: The name the type is declared with.
+        """
+        declared_name = self.declared_names.get(py_type)
+        if declared_name is not None:
+            return declared_name
+        declared_name = name
+        suffix = 2
+        while declared_name in self.declarations or declared_name in self.reserved_names:
+            declared_name = f"{name}{suffix}"
+            suffix += 1
+        self.declared_names[py_type] = declared_name
+        # reserve the name, the declarations made while rendering this one can't take it
+        self.declarations[declared_name] = ""
+        self.declarations[declared_name] = render(declared_name)
+        return declared_name
+
+
+def register_converter(key: Any, converter: Optional[Converter] = None) -> Any:
+    """
+    Register a converter that translates a python type into TypeScript.
+
+    The key can be:
+    - The origin of a parametrized type (`list`, `dict`, `Union`, `Literal`...),
+      which handles every parametrization of it (`List[int]`, `dict[str, Room]`...).
+    - A class, which also handles its subclasses unless they have a converter
+      of their own. Subclasses of the built-in containers that have
+      properties, like NamedTuples and TypedDicts, are interfaces instead.
+    - A metaclass, which handles every class created with it (`enum.EnumMeta`).
+    - A hashable special form or value such as `Any` or `None`.
+
+    Registering a key that is already registered replaces its converter.
+    Can also be used as a decorator: `@register_converter(MyType)`.
+
+    :param key: The type the converter is responsible for.
+    :param converter: The converter function.
+    :return: The converter, so the function can be used as a decorator.
+    """
+    if converter is None:
+        def decorator(func: Converter) -> Converter:
+            return register_converter(key, func)
+        return decorator
 
-    type_mapping = {
-        str: "string",
-        int: "number",
-        float: "number",
-        bool: "boolean",
-        type(None): "null",
-        None: "null",
-        Any: "any",
-    }
+    _CONVERTERS[key] = converter
+    # a new key can change the converter of the classes it is a base of
+    _RESOLVED.clear()
+    return converter
+
+
+def unregister_converter(key: Any) -> None:
+    """
+    Remove the converter registered for a key.
+
+    :param key: The key the converter was registered with.
+    """
+    if key not in _CONVERTERS:
+        raise KeyError(f"There is no converter registered for {key!r}.")
+    del _CONVERTERS[key]
+    _RESOLVED.clear()
+
+
+def get_converter(py_type: Any) -> Optional[Converter]:
+    """
+    Find the registered converter for a python type, if any.
+
+    Parametrized types are looked up by their origin, classes by themselves,
+    their metaclass and then their bases, and any other object by itself and
+    then by its type. The converter of each class is remembered until a
+    converter is registered or unregistered, so classes, the most common
+    case, take a single lookup.
+    """
+    if isinstance(py_type, type):
+        try:
+            return _RESOLVED[py_type]
+        except KeyError:
+            converter = _RESOLVED[py_type] = _class_converter(py_type)
+            return converter
+
+    origin = get_origin(py_type)
+    if origin is not None:
+        return _CONVERTERS.get(origin)
+
+    try:
+        converter = _CONVERTERS.get(py_type)
+    except TypeError:
+        # unhashable objects can only be matched by their type
+        converter = None
+    return converter or _CONVERTERS.get(type(py_type))
+
+
+def _class_converter(cls: type) -> Optional[Converter]:
+    converter = _CONVERTERS.get(cls) or _CONVERTERS.get(type(cls))
+    if converter is not None:
+        return converter
+    # classes with properties, like NamedTuples and TypedDicts, are
+    # interfaces even if they subclass a container
+    containers = _CONTAINERS if _has_annotations(cls) else ()
+    for base in cls.__mro__[1:-1]:
+        if base in containers:
+            continue
+        converter = _CONVERTERS.get(base)
+        if converter is not None:
+            return converter
+    return None
 
-    return type_mapping.get(py_type, "any")
 
 def _is_parametrized_generic(type: Type) -> bool:
     """Returns true if type is a parametrized generic class
@@ -41,6 +293,10 @@ def _is_generic(type: Type) -> bool:
     """
     return get_origin(type) is None and len(getattr(type, "__parameters__", [])) > 0
 
+def _has_annotations(cls: type) -> bool:
+    return any(getattr(base, "__annotations__", None) for base in cls.__mro__[:-1])
+
+
 def _is_user_defined_class(py_type: Type) -> bool:
     if isinstance(py_type, type) and py_type.__module__ != 'builtins':
         return True
@@ -48,14 +304,20 @@ def _is_user_defined_class(py_type: Type) -> bool:
     return False
 
 
-def ts_name(py_type: Type) -> str:
+def ts_name(py_type: Type, naming: Optional[NamingPolicy] = None, symbols: Optional[SymbolTable] = None) -> str:
     """Returns the typescript interface ts_name for a python type
     
     - NonGeneric -> NonGeneric (same as python ts_name)
     - GenericClass -> GenericClass<a, b>
     - GenericClass[Potatos, Carrots] -> PotatosCarrotsGenericClass 
     - Partially parametrized classes are not yet supported
+    - With a naming policy, the name is decided by the policy
+    - With a symbol table, the name is the one the table gives the type
     """
+    if symbols is not None:
+        return symbols.name(py_type)
+    if naming is not None:
+        return naming.name(py_type)
     if _is_parametrized_generic(py_type):
         origin: Any = get_origin(py_type)
         origin_name = origin.__name__
@@ -78,119 +340,533 @@ def _substitute_typevars(t: Type, substitutions: Dict[Type, Type]) -> Type:
         return t.__origin__[new_args]
     return t
 
-def py_type_to_ts_string(py_type: Type, allowed_refs: List[str], indent: int = 0) -> str:
+
+def _parametrized_generic_properties(py_type: Type) -> Dict[str, Any]:
     """
-    Converts a Python type into a TypeScript definition, with support for indentation.
-    :param py_type: The Python type to convert.
-    :param allowed_refs: Dictionary of allowed classes for references.
-    :param indent: Current indentation level.
-    :return: A string with the corresponding TypeScript code.
+    Returns the type hints of a parametrized generic class with its type
+    variables replaced by the types it is parametrized with.
+    """
+    origin = get_origin(py_type)
+    args = get_args(py_type)
+    type_params = getattr(origin, '__parameters__', ())  # tuple of typevars
+    typevar_to_type = dict(zip(type_params, args))  # dict of typevar to its associated type
+    nested_properties = get_type_hints(origin)
+    return {property_name: _substitute_typevars(type, typevar_to_type) for property_name, type in nested_properties.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _pascal_case(name: str) -> str:
+    return "".join(part[:1].upper() + part[1:] for part in name.split("_"))
+
+
+def _render_properties(owner_name: str, properties: Dict[str, Any], context: ConversionContext, indent: int) -> ConverterSteps:
+    """
+    Write the body of an inline object type, one property per line.
     """
-    INDENTATION = "    "
     current_indent = INDENTATION * indent
     next_indent = INDENTATION * (indent + 1)
+    outer_name_hint = context.name_hint
+    lines = []
+    for prop, prop_type in properties.items():
+        context.name_hint = f"{owner_name}{_pascal_case(prop)}"
+        prop_ts = yield prop_type, indent + 1
+        lines.append(f"{next_indent}{prop}: {prop_ts};\n")
+    context.name_hint = outer_name_hint
+    return f"{{\n{''.join(lines)}{current_indent}}}"
 
-    if _is_user_defined_class(py_type):
-        if ts_name(py_type) in allowed_refs:
-            return ts_name(py_type)
-        else:
-            # a reference to this type is not permitted,
-            # so represent it by writting its properties
-            # and types 
-            nested_properties = get_type_hints(py_type)
-            nested_body = "".join(
-                f"{next_indent}{nested_prop}: {py_type_to_ts_string(nested_type, allowed_refs, indent + 1)};\n"
-                for nested_prop, nested_type in nested_properties.items()
-            )
-            return f"{{\n{nested_body}{current_indent}}}"
-    elif get_origin(py_type) == list:
-        item_type = get_args(py_type)[0]
-        return f"{py_type_to_ts_string(item_type, allowed_refs, indent)}[]"
-    elif get_origin(py_type) is Literal:
-        literal_args = get_args(py_type)
-        def literal_value_to_ts(value: Any) -> str:
-            if value is None:
-                return "null"
-            elif isinstance(value, str):
-                return f"'{value}'"
-            elif isinstance(value, bool):
-                return "true" if value else "false"
+
+def _render_model(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    """
+    Write the properties of a class, or a parametrized generic, as an inline
+    object type.
+    """
+    origin = get_origin(py_type)
+    if origin is not None and context.reference(origin) is not None:
+        raise ValueError("Translating a parametrized generic with its generic class as a valid reference is not yet supported.")
+    if py_type in context._inlining:
+        cycle = [*list(context._inlining)[list(context._inlining).index(py_type):], py_type]
+        names = " -> ".join(ts_name(model, context.naming) for model in cycle)
+        raise ValueError(f"{ts_name(py_type, context.naming)} references itself ({names}), so it can't be written inline. Give it an interface of its own.")
+    context._inlining[py_type] = None
+    try:
+        # it only needs a name for the declarations inside
+        return (yield from _render_properties(ts_name(py_type, context.naming), context.properties(py_type), context, indent))
+    finally:
+        del context._inlining[py_type]
+
+
+def _convert_class(py_type: Type, context: ConversionContext, indent: int) -> Union[str, ConverterSteps]:
+    name = context.reference(py_type)
+    if name is not None:
+        return name
+    # a reference to this type is not permitted,
+    # so represent it by writting its properties
+    # and types
+    return _render_model(py_type, context, indent)
+
+
+def _convert_parametrized_generic(py_type: Type, context: ConversionContext, indent: int) -> Union[str, ConverterSteps]:
+    name = context.reference(py_type)
+    if name is not None:
+        return name
+    return _render_model(py_type, context, indent)
+
+
+def _is_type_alias(py_type: Any) -> bool:
+    """
+    Returns true if the type was made with a `type X = ...` statement.
+    """
+    return isinstance(py_type, _TYPE_ALIAS_TYPES)
+
+
+def _declare_alias(key: Any, name: str, value: Any, context: ConversionContext) -> str:
+    """
+    Declare `export type name = value;` once, converting the value with the
+    name as the hint for the types it declares.
+    """
+    def render(declared_name: str) -> str:
+        if get_origin(value) is Literal:
+            # the alias is the named literal type, not a name for another one
+            context.declared_names.setdefault(value, declared_name)
+            literal_args = get_args(value)
+            threshold = context.literal_alias_threshold
+            named = threshold is not None and len(literal_args) >= threshold
+            return _literal_declaration(declared_name, literal_args, context.literal_style if named else "union")
+        outer_refs, outer_name_hint = context.allowed_refs, context.name_hint
+        if context.declaration_refs is not None:
+            context.allowed_refs = context.declaration_refs
+        context.name_hint = declared_name
+        # the value itself is not looked up in `type_aliases`, it would be this alias
+        value_ts = _convert_type(value, context, 0)
+        context.allowed_refs, context.name_hint = outer_refs, outer_name_hint
+        return f"export type {declared_name} = {value_ts};\n"
+
+    return context.declare(key, name, render)
+
+
+def _convert_type_alias(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    name = context.reference(py_type)
+    if name is not None:
+        return name
+    if not context.declare_aliases:
+        return (yield py_type.__value__, indent)
+    return _declare_alias(py_type, context.ts_name(py_type), py_type.__value__, context)
+
+for _alias_type in _TYPE_ALIAS_TYPES:
+    register_converter(_alias_type, _convert_type_alias)
+
+
+def _convert(py_type: Any, context: ConversionContext, indent: int) -> str:
+    return _run(_convert_step(py_type, context, indent), context)
+
+
+def _convert_type(py_type: Any, context: ConversionContext, indent: int) -> str:
+    """
+    Convert a type without looking it up in `context.type_aliases`.
+    """
+    return _run(_convert_type_step(py_type, context, indent), context)
+
+
+def _run(step: Union[str, ConverterSteps], context: ConversionContext) -> str:
+    """
+    Run a conversion to the end. Converters that are generators are kept in
+    a stack while the nested types they yield are converted, instead of
+    calling each other recursively.
+    """
+    if isinstance(step, str):
+        return step
+    stack = [step]
+    ts: Any = None
+    error: Optional[Exception] = None
+    while stack:
+        try:
+            if error is None:
+                nested, indent = stack[-1].send(ts)
             else:
-                # for ints, floats, etc
-                return str(value)
-
-        union_of_literals = " | ".join(literal_value_to_ts(arg) for arg in literal_args)
-        return union_of_literals
-    elif get_origin(py_type) == Union:  
-        # This includes Optionals as Optional[str] is Union[str, None]
-        union_args = get_args(py_type)
-        non_none_args = [arg for arg in union_args if arg is not type(None)]
-        union_str = " | ".join(py_type_to_ts_string(arg, allowed_refs, indent) for arg in non_none_args)
-        if type(None) in union_args:
-            union_str = f"{union_str} | null"
-        return union_str
-    elif _is_parametrized_generic(py_type):
-        if ts_name(py_type) in allowed_refs:
-            return ts_name(py_type)
-        origin = get_origin(py_type)
-        assert origin  # damn mypy
-        args = get_args(py_type)
-        if hasattr(origin, "__annotations__"):
-            type_params = getattr(origin, '__parameters__', ())  # tuple of typevars
-            typevar_to_type = dict(zip(type_params, args))  # dict of typevar to its associated type
-            if ts_name(origin) in allowed_refs:
-                raise ValueError("Translating a parametrized generic with its generic class as a valid reference is not yet supported.")
-                arg_ts_list = [py_type_to_ts_string(_substitute_typevars(a, typevar_to_type), allowed_refs, indent) for a in args]
-                return f"{ts_name(origin)}<{', '.join(arg_ts_list)}>"
+                # raised where the converter yielded, as if it had called context.convert
+                thrown, error = error, None
+                nested, indent = stack[-1].throw(thrown)
+        except StopIteration as stop:
+            stack.pop()
+            ts = stop.value
+            continue
+        except Exception as exception:
+            stack.pop()
+            if not stack:
+                raise
+            error = exception
+            continue
+        try:
+            if context.type_aliases:
+                nested_step = _convert_step(nested, context, indent)
             else:
-                nested_properties = get_type_hints(origin)
-                substituted_properties = {property_name: _substitute_typevars(type, typevar_to_type) for property_name, type in nested_properties.items()}
-                nested_body = ";\n".join(
-                    f"{next_indent}{prop}: {py_type_to_ts_string(t, allowed_refs, indent + 1)}"
-                    for prop, t in substituted_properties.items()
-                ) + ";\n"
-                return f"{{\n{nested_body}{current_indent}}}"
+                nested_step = _convert_type_step(nested, context, indent)
+        except Exception as exception:
+            error = exception
+            continue
+        if isinstance(nested_step, str):
+            ts = nested_step
         else:
-            # Generic type without annotations
-            # Could be an integrated generic type we don't support yet
-            raise ValueError("This unannotated generic type is not supported yet.")
-            return _primitive_to_ts(py_type)
+            stack.append(nested_step)
+            ts = None
+    return ts
+
+
+def _convert_step(py_type: Any, context: ConversionContext, indent: int) -> Union[str, ConverterSteps]:
+    if context.type_aliases:
+        try:
+            alias_name = context.type_aliases.get(py_type)
+        except TypeError:
+            alias_name = None
+        if alias_name is not None and alias_name in context.allowed_refs:
+            return alias_name
+        if alias_name is not None and context.declare_aliases:
+            return _declare_alias(("alias", alias_name), alias_name, py_type, context)
+    return _convert_type_step(py_type, context, indent)
+
+
+def _convert_type_step(py_type: Any, context: ConversionContext, indent: int) -> Union[str, ConverterSteps]:
+    if isinstance(py_type, str):
+        # If the type is already a string, return it as-is
+        return py_type
+
+    if context.ts_types:
+        try:
+            code = context.ts_types.get(py_type)
+        except TypeError:
+            code = None
+        if code is not None:
+            return code
+
+    converter = get_converter(py_type)
+    if converter is not None:
+        return converter(py_type, context, indent)
+
+    origin = get_origin(py_type)
+    if origin is not None:
+        if hasattr(origin, "__annotations__"):
+            return _convert_parametrized_generic(py_type, context, indent)
+        # Generic type without annotations
+        # Could be an integrated generic type we don't support yet
+        raise ValueError("This unannotated generic type is not supported yet.")
+    if _is_user_defined_class(py_type):
+        return _convert_class(py_type, context, indent)
+    return "any"
+
+
+def py_type_to_ts_string(
+    py_type: Any,
+    allowed_refs: Collection[str],
+    indent: int = 0,
+    naming: Optional[NamingPolicy] = None,
+    symbols: Optional[SymbolTable] = None,
+) -> str:
+    """
+    Converts a Python type into a TypeScript definition, with support for indentation.
+    :param py_type: The Python type to convert.
+    :param allowed_refs: Names of the allowed classes for references.
+    :param indent: Current indentation level.
+    :param naming: Naming policy used for the names of the referenced classes.
+    :param symbols: Symbol table the referenced classes were named with.
+    :return: A string with the corresponding TypeScript code.
+    """
+    return _convert(py_type, ConversionContext(allowed_refs, naming=naming, symbols=symbols), indent)
+
+
+# Built-in converters
+
+def _constant_converter(ts_type: str) -> Converter:
+    def converter(py_type: Any, context: ConversionContext, indent: int) -> str:
+        return ts_type
+    return converter
+
+
+for _key, _ts_type in [
+    (str, "string"),
+    (int, "number"),
+    (float, "number"),
+    (bool, "boolean"),
+    (type(None), "null"),
+    (None, "null"),
+    (Any, "any"),
+    (bytes, "string"),
+    (datetime.datetime, "string"),
+    (datetime.date, "string"),
+    (datetime.time, "string"),
+    (uuid.UUID, "string"),
+    (decimal.Decimal, "string"),
+]:
+    register_converter(_key, _constant_converter(_ts_type))
+
+
+def _ts_string_literal(value: str) -> str:
+    """
+    Write a python string as a single quoted TypeScript string literal.
+    """
+    escaped = json.dumps(value, ensure_ascii=False)[1:-1]
+    return "'" + escaped.replace('\\"', '"').replace("'", "\\'") + "'"
+
+
+def _literal_value_to_ts(value: Any) -> str:
+    if isinstance(value, enum.Enum):
+        # Literal[Color.RED] is the value of the member
+        value = value.value
+    if value is None:
+        return "null"
+    elif isinstance(value, str):
+        return _ts_string_literal(value)
+    elif isinstance(value, bool):
+        return "true" if value else "false"
     else:
-        # Traducir tipos simples o no soportados
-        return _primitive_to_ts(py_type)
+        # for ints, floats, etc
+        return str(value)
+
+
+@register_converter(Literal)
+def _convert_literal(py_type: Any, context: ConversionContext, indent: int) -> str:
+    literal_args = get_args(py_type)
+    threshold = context.literal_alias_threshold
+    if threshold is None or len(literal_args) < threshold:
+        return " | ".join(_literal_value_to_ts(arg) for arg in literal_args)
+
+    declared_name = context.declared_names.get(py_type)
+    if declared_name is not None:
+        return declared_name
+    name = context.literal_names.get(py_type, context.name_hint)
+    if name is None:
+        # nothing to name it after, so it is written inline
+        return " | ".join(_literal_value_to_ts(arg) for arg in literal_args)
+
+    return context.declare(py_type, name, lambda name: _literal_declaration(name, literal_args, context.literal_style))
+
+
+def _literal_declaration(name: str, literal_args: Tuple[Any, ...], style: Literal["union", "const_array"]) -> str:
+    if style == "const_array":
+        values = ", ".join(_literal_value_to_ts(arg) for arg in literal_args)
+        return (
+            f"export const {name}Values = [{values}] as const;\n"
+            f"export type {name} = typeof {name}Values[number];\n"
+        )
+    union = " | ".join(_literal_value_to_ts(arg) for arg in literal_args)
+    return f"export type {name} = {union};\n"
+
+
+@register_converter(enum.EnumMeta)
+def _convert_enum(py_type: Any, context: ConversionContext, indent: int) -> str:
+    name = context.reference(py_type)
+    if name is not None:
+        return name
+    style = context.enum_style
+    if style is None:
+        return " | ".join(_literal_value_to_ts(member.value) for member in py_type)
+
+    def render(name: str) -> str:
+        members = py_type.__members__.items()
+        if style == "union":
+            return f"export type {name} = {' | '.join(_literal_value_to_ts(member.value) for member in py_type)};\n"
+        for member_name, member in members:
+            if isinstance(member.value, bool) or not isinstance(member.value, (str, int, float)):
+                raise ValueError(f"{py_type.__name__}.{member_name} has a value that is not a string or a number, so it can't be a {style}.")
+        if style == "const_enum":
+            body = "".join(f"{INDENTATION}{member_name} = {_literal_value_to_ts(member.value)},\n" for member_name, member in members)
+            return f"export const enum {name} {{\n{body}}}\n"
+        body = "".join(f"{INDENTATION}{member_name}: {_literal_value_to_ts(member.value)},\n" for member_name, member in members)
+        return (
+            f"export const {name} = {{\n{body}}} as const;\n"
+            f"export type {name} = typeof {name}[keyof typeof {name}];\n"
+        )
+
+    return context.declare(py_type, context.ts_name(py_type), render)
+
+
+def _convert_union(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    # This includes Optionals as Optional[str] is Union[str, None]
+    union_args = get_args(py_type)
+    non_none_args = [arg for arg in union_args if arg is not type(None)]
+    args_ts = []
+    for arg in non_none_args:
+        args_ts.append((yield arg, indent))
+    union_str = " | ".join(args_ts)
+    if type(None) in union_args:
+        union_str = f"{union_str} | null"
+    return union_str
+
+register_converter(Union, _convert_union)
+register_converter(types.UnionType, _convert_union)
 
 
-def generate_typescript_interfaces(py_types: List[Type]) -> str:
+@register_converter(Annotated)
+def _convert_annotated(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    # Annotated[T, ...] is T with metadata TypeScript knows nothing about
+    return (yield py_type.__origin__, indent)
+
+
+def _convert_array(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    args = get_args(py_type)
+    item_type = args[0] if args else Any
+    item_ts = yield item_type, indent
+    return f"{item_ts}[]"
+
+for _key in [list, set, frozenset, collections.abc.Sequence, collections.abc.MutableSequence,
+             collections.abc.Set, collections.abc.MutableSet, collections.abc.Iterable,
+             collections.abc.Collection]:
+    register_converter(_key, _convert_array)
+    _CONTAINERS.add(_key)
+
+
+def _convert_tuple(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    args = get_args(py_type)
+    if not args:
+        # bare tuple or Tuple[()]
+        return "[]" if getattr(py_type, "__args__", None) == () else "any[]"
+    if len(args) == 2 and args[1] is Ellipsis:
+        item_ts = yield args[0], indent
+        return f"{item_ts}[]"
+    args_ts = []
+    for arg in args:
+        args_ts.append((yield arg, indent))
+    return f"[{', '.join(args_ts)}]"
+
+register_converter(tuple, _convert_tuple)
+_CONTAINERS.add(tuple)
+
+
+def _convert_mapping(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+    args = get_args(py_type)
+    key_type, value_type = args if args else (str, Any)
+    key_ts = yield key_type, indent
+    value_ts = yield value_type, indent
+    return f"Record<{key_ts}, {value_ts}>"
+
+for _key in [dict, collections.abc.Mapping, collections.abc.MutableMapping]:
+    register_converter(_key, _convert_mapping)
+    _CONTAINERS.add(_key)
+
+
+def generate_typescript_interfaces(
+    py_types: List[Type],
+    literal_alias_threshold: Optional[int] = None,
+    literal_style: Literal["union", "const_array"] = "union",
+    literal_names: Optional[Dict[Any, str]] = None,
+    reachable_from: Optional[List[Any]] = None,
+    naming: Optional[NamingPolicy] = None,
+    enum_style: Literal["const_enum", "union", "const_object"] = "union",
+    type_only: bool = False,
+    type_aliases: Optional[Dict[str, Any]] = None,
+    symbols: Optional[SymbolTable] = None,
+    ts_types: Optional[Dict[Any, str]] = None,
+) -> str:
     """
     Generate TypeScript interface definitions for a list of Python classes.
 
     :param py_types: A list of Python classes to convert to TypeScript interfaces.
+    :param literal_alias_threshold: Literal types with at least this many values
+                                    are declared once as a named type, written
+                                    before the interfaces, and referenced by name.
+    :param literal_style: "union" or "const_array", see `ConversionContext`.
+    :param literal_names: Names for specific Literal types. By default they are
+                          named after the first class and property using them.
+    :param reachable_from: Only generate the interfaces of the classes that can
+                           be reached from these types, such as the request
+                           and response types of some endpoints.
+    :param naming: Naming policy for the interface names.
+    :param enum_style: How Enum classes are declared: "const_enum", "union" or
+                       "const_object", see `ConversionContext`. Each one is
+                       declared once, before the interfaces, and referenced by
+                       name. Enums in `py_types` are declared even if unused.
+    :param type_only: Make sure the output only declares types, so the module
+                      is erased completely from the JavaScript output. Styles
+                      that declare values are not allowed.
+    :param type_aliases: Python type aliases by name, like
+                         `{"RoomResponse": ResponseModel[Room]}`, see
+                         `find_type_aliases`. Each one is declared once, before
+                         the interfaces, as `export type RoomResponse = ...` and
+                         the properties of that type reference it by name.
+                         Aliases made with `type X = ...` in `py_types` are
+                         declared too, and the ones that are only used by the
+                         classes are declared as they are found.
+    :param symbols: Symbol table that names the declared types. By default, a
+                    new one following `naming`, which adds a suffix to the
+                    names two types would share. Pass your own to look up the
+                    name of each type afterwards and to give it to the
+                    functions that reference the interfaces, or
+                    `SymbolTable(naming, on_collision="error")` to fail instead.
+    :param ts_types: TypeScript code for specific python types, such as
+                     `{datetime: "Date"}` for properties revived by
+                     `generate_typescript_revivers`.
     :return: A string with all TypeScript interfaces.
     """
+    if type_only and ((literal_style != "union" and literal_alias_threshold is not None) or enum_style != "union"):
+        raise ValueError("A type only module can only declare literals and enums as unions.")
+
+    from py_writes_ts.dependency_graph import is_model, reachable_models
+
+    if reachable_from is not None:
+        py_types = reachable_models(py_types, reachable_from)
+
     processed_interfaces = {}
+    context = ConversionContext(
+        literal_alias_threshold=literal_alias_threshold,
+        literal_style=literal_style,
+        literal_names=literal_names or {},
+        naming=naming,
+        enum_style=enum_style,
+        type_aliases={py_type: name for name, py_type in (type_aliases or {}).items() if not _is_type_alias(py_type)},
+        declare_aliases=True,
+        symbols=symbols if symbols is not None else SymbolTable(naming),
+        ts_types=ts_types or {},
+    )
 
-    def process_class(interface_name: str, cls: Type, allowed_refs: List[str]) -> None:
+    def process_class(interface_name: str, cls: Type, allowed_refs: AbstractSet[str]) -> None:
         """
         Process a single class to generate a TypeScript interface.
 
         :param interface_name: Name of the TypeScript interface.
         :param cls: The Python class to process.
-        :param allowed_refs: A dictionary of allowed classes for generating separate interfaces.
+        :param allowed_refs: The names of the classes that get their own interfaces.
         :return: The generated TypeScript interface as a string.
         """
         if interface_name in processed_interfaces:
             return
 
-        allowed_classes_excluding_cls = [ts_name for ts_name in allowed_refs if ts_name != interface_name]
-        type_body = py_type_to_ts_string(cls, allowed_classes_excluding_cls)
+        if is_model(cls):
+            # its properties can reference it, like `children: Node[]`
+            context.allowed_refs = allowed_refs
+            type_body = _run(_render_model(cls, context, 0), context)
+        else:
+            context.allowed_refs = allowed_refs - {interface_name}
+            # skip the type aliases, the interface of an aliased type is still written
+            type_body = _convert_type(cls, context, 0)
         interface_definition = f"export interface {interface_name} {type_body}\n"
 
         processed_interfaces[interface_name] = interface_definition
 
-    # Process each class in the list
-    allowed_refs = [ts_name(cls) for cls in py_types]
+    # Name each class
+    named_classes: Dict[str, Type] = {}
+    declared_types = []
     for cls in py_types:
-        process_class(ts_name(cls), cls, allowed_refs)
+        if isinstance(cls, enum.EnumMeta) or _is_type_alias(cls):
+            declared_types.append(cls)
+            continue
+        # the symbol table makes sure two classes don't share a name
+        named_classes[context.ts_name(cls)] = cls
+
+    # Declare the enums and type aliases, which can reference every interface
+    allowed_refs = set(named_classes)
+    context.declaration_refs = allowed_refs
+    context.allowed_refs = allowed_refs
+    context.reserved_names = allowed_refs
+    for py_type in declared_types:
+        context.convert(py_type)
+    for name, py_type in (type_aliases or {}).items():
+        if _is_type_alias(py_type):
+            context.convert(py_type)
+        else:
+            _declare_alias(("alias", name), name, py_type, context)
+
+    # Process each class in the list
+    for name, cls in named_classes.items():
+        process_class(name, cls, allowed_refs)
 
-    # Combine all processed interfaces
-    return "\n".join(processed_interfaces.values())
+    # Combine the declarations and all processed interfaces
+    return "\n".join([*context.declarations.values(), *processed_interfaces.values()])
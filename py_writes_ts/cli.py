@@ -0,0 +1,315 @@
+"""
+Command line entry point: `py-writes-ts -c py-writes-ts.toml`
+
+The config file (TOML, or JSON if it ends in `.json`) lists the files to
+generate. Paths are relative to the config file, and its folder is added to
+`sys.path` so the model modules can be imported.
+
+    jobs = 4                 # optional defaults for the command line flags
+    cache = true
+    write_if_changed = true
+
+    [[outputs]]
+    path = "frontend/src/sdk.ts"
+    header = "// Generated by py-writes-ts, do not edit.\\n"
+    imports = [{ module = "./common", names = ["Page"], type_only = true }]
+    type_only = false        # true to fail if the file would declare values, such as endpoints
+    models = ["app.models", "app.responses:ResponseModel[app.models:Room]"]
+    aliases = ["app.models", "app.responses:RoomResponse"]   # type aliases to declare
+    # manifest = "build/types.json"   # instead of models and aliases, see export_manifest
+    renames = { "app.models:User" = "UserDto" }
+    prefix = ""              # naming policy for the other interfaces
+    suffix = ""
+    prune = true             # only models reachable from the endpoints
+    literal_alias_threshold = 50
+    enum_style = "const_enum"  # or "union" (default), "const_object"
+    client = "table"         # one `call` function for every endpoint, instead of "functions"
+    wrappers = true          # with client = "table", also a one line function per endpoint
+
+    [[outputs.endpoints]]
+    name = "getUserById"
+    path = "/api/get_user_by_id"
+    request = "app.models:GetUserByIdRequest"
+    response = "app.models:GetUserByIdResponse"
+    cache = { ttl_ms = 30000, max_entries = 100, etag = true }   # optional
+    stream = false           # true to stream the items of a list response as NDJSON
+
+A model is either a module, which includes every model class defined in it,
+or `module:Name`, optionally parametrized with other models in brackets.
+Aliases are modules, which include every type alias in them, or `module:Name`.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from py_writes_ts.class_to_interface import _is_generic, generate_typescript_interfaces
+from py_writes_ts.dependency_graph import is_model
+from py_writes_ts.function_generator import Endpoint, EndpointCache, generate_client_runtime, generate_endpoint_function, generate_endpoint_table
+from py_writes_ts.import_generator import generate_typescript_import
+from py_writes_ts.manifest import load_manifest
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.server import models_fingerprint
+from py_writes_ts.symbols import SymbolTable
+from py_writes_ts.type_aliases import find_type_aliases
+
+DEFAULT_CONFIG = "py-writes-ts.toml"
+CACHE_FILE = ".py-writes-ts-cache.json"
+
+
+@dataclass
+class OutputResult:
+    """
+    What happened to one output file.
+
+    :param path: The output file.
+    :param status: "written", "unchanged" (same content, not rewritten) or
+                   "cached" (models didn't change, not generated).
+    :param fingerprint: Fingerprint of the models and settings of the output.
+    :param timings: Seconds spent in each step: "import", "render" and "write".
+    """
+    path: str
+    status: str
+    fingerprint: str
+    timings: Dict[str, float]
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Read a config file, TOML or JSON depending on its extension.
+    """
+    with open(path, "rb") as file:
+        if path.endswith(".json"):
+            return json.load(file)
+        return tomllib.load(file)
+
+
+def resolve_type(reference: str, namespace: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Import the type a reference points to.
+
+    resolve_type("app.models:Room") -> Room
+    resolve_type("app.responses:ResponseModel[app.models:Room]") -> ResponseModel[Room]
+
+    :param namespace: Types by reference, looked up before importing anything,
+                      such as the models of a manifest.
+    """
+    reference = reference.strip()
+    if reference.endswith("]"):
+        base, args = reference[:-1].split("[", 1)
+        return resolve_type(base, namespace)[tuple(resolve_type(arg, namespace) for arg in _split_args(args))]
+    if namespace is not None and reference in namespace:
+        return namespace[reference]
+    module_name, _, name = reference.partition(":")
+    if not name:
+        raise ValueError(f"'{reference}' is not a type reference, use 'module:Name'.")
+    value: Any = importlib.import_module(module_name)
+    for attribute in name.split("."):
+        value = getattr(value, attribute)
+    return value
+
+
+def _split_args(args: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for index, char in enumerate(args):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(args[start:index])
+            start = index + 1
+    parts.append(args[start:])
+    return parts
+
+
+def resolve_models(references: List[str]) -> List[Any]:
+    """
+    Import the models of an output. A module reference includes every model
+    class defined in that module, in definition order.
+    """
+    models: List[Any] = []
+    for reference in references:
+        if ":" in reference:
+            found = [resolve_type(reference)]
+        else:
+            module = importlib.import_module(reference)
+            found = [
+                value for value in vars(module).values()
+                if isinstance(value, type) and value.__module__ == module.__name__
+                and is_model(value) and not _is_generic(value)
+            ]
+        models.extend(model for model in found if model not in models)
+    return models
+
+
+def resolve_aliases(references: List[str]) -> Dict[str, Any]:
+    """
+    Import the type aliases of an output, by name.
+    """
+    aliases: Dict[str, Any] = {}
+    for reference in references:
+        if ":" in reference:
+            aliases[reference.rpartition(":")[2].rpartition(".")[2]] = resolve_type(reference)
+        else:
+            aliases.update(find_type_aliases(importlib.import_module(reference)))
+    return aliases
+
+
+def _write_if_changed(path: str, code: str, write_if_changed: bool) -> bool:
+    if write_if_changed and os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            if file.read() == code:
+                return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(code)
+    return True
+
+
+def render_output(output: Dict[str, Any], base_dir: str, cached_fingerprint: Optional[str] = None, write_if_changed: bool = False) -> OutputResult:
+    """
+    Generate one output file of the config.
+
+    :param output: The output section of the config.
+    :param base_dir: Folder the paths of the config are relative to.
+    :param cached_fingerprint: Fingerprint of the last generation of this file.
+                               If it didn't change and the file exists, it isn't generated.
+    :param write_if_changed: Don't touch the file if its content is already up to date.
+    :return: What was done.
+    """
+    if base_dir not in sys.path:
+        sys.path.insert(0, base_dir)
+    path = os.path.join(base_dir, output["path"])
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    namespace: Optional[Dict[str, Any]] = None
+    fingerprint_extra: Any = output
+    if "manifest" in output:
+        with open(os.path.join(base_dir, output["manifest"]), encoding="utf-8") as file:
+            manifest_json = json.load(file)
+        manifest = load_manifest(manifest_json)
+        models, aliases, namespace = manifest.types, manifest.type_aliases, manifest.models
+        # the rebuilt types don't carry everything, such as the code of custom converters
+        fingerprint_extra = (output, manifest_json)
+    else:
+        models = resolve_models(output.get("models", []))
+        aliases = resolve_aliases(output.get("aliases", []))
+    endpoints = [
+        Endpoint(
+            name=endpoint["name"],
+            path=endpoint["path"],
+            request_type=resolve_type(endpoint["request"], namespace),
+            response_type=resolve_type(endpoint["response"], namespace),
+            method=endpoint.get("method", "POST"),
+            cache=EndpointCache(**endpoint["cache"]) if "cache" in endpoint else None,
+            stream=endpoint.get("stream", False),
+        )
+        for endpoint in output.get("endpoints", [])
+    ]
+    if output.get("type_only", False) and endpoints:
+        # the endpoint functions and the client runtime are values
+        raise ValueError(f"{output['path']} is type only, so it can't have endpoints. Generate them in another output that imports its types.")
+    naming = NamingPolicy(
+        renames={resolve_type(reference, namespace): name for reference, name in output.get("renames", {}).items()},
+        prefix=output.get("prefix", ""),
+        suffix=output.get("suffix", ""),
+    )
+    endpoint_types = [t for endpoint in endpoints for t in (endpoint.request_type, endpoint.response_type)]
+    # the config only has the names of the aliases, not what they resolve to
+    fingerprint = models_fingerprint(models + endpoint_types + list(aliases.values()), (fingerprint_extra, aliases))
+    timings["import"] = time.perf_counter() - start
+
+    if cached_fingerprint == fingerprint and os.path.exists(path):
+        return OutputResult(output["path"], "cached", fingerprint, timings)
+
+    start = time.perf_counter()
+    # the functions reference the interfaces by the names the table gave them
+    symbols = SymbolTable(naming)
+    code = output.get("header", "")
+    for import_ in output.get("imports", []):
+        code += generate_typescript_import(import_["module"], import_["names"], type_only=import_.get("type_only", False))
+    code += generate_typescript_interfaces(
+        models,
+        literal_alias_threshold=output.get("literal_alias_threshold"),
+        literal_style=output.get("literal_style", "union"),
+        enum_style=output.get("enum_style", "union"),
+        reachable_from=endpoint_types if output.get("prune") else None,
+        naming=naming,
+        type_only=output.get("type_only", False),
+        type_aliases=aliases,
+        symbols=symbols,
+    )
+    if any(endpoint.cache is not None for endpoint in endpoints):
+        code += generate_client_runtime()
+    if output.get("client", "functions") == "table":
+        table_endpoints = [endpoint for endpoint in endpoints if not endpoint.stream]
+        code += generate_endpoint_table(table_endpoints, valid_refs=models, naming=naming, wrappers=output.get("wrappers", True), symbols=symbols)
+        endpoints = [endpoint for endpoint in endpoints if endpoint.stream]
+    for endpoint in endpoints:
+        code += generate_endpoint_function(endpoint, valid_refs=models, naming=naming, symbols=symbols)
+    timings["render"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    written = _write_if_changed(path, code, write_if_changed)
+    timings["write"] = time.perf_counter() - start
+    return OutputResult(output["path"], "written" if written else "unchanged", fingerprint, timings)
+
+
+def _print_timings(results: List[OutputResult], total: float) -> None:
+    width = max([len(result.path) for result in results] + [6])
+    print(f"{'output':<{width}}  {'status':<9}  {'import':>8}  {'render':>8}  {'write':>8}")
+    for result in results:
+        columns = "  ".join(f"{result.timings[step] * 1000:>6.1f}ms" if step in result.timings else f"{'-':>8}" for step in ("import", "render", "write"))
+        print(f"{result.path:<{width}}  {result.status:<9}  {columns}")
+    print(f"{len(results)} outputs in {total * 1000:.1f}ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="py-writes-ts", description="Generate TypeScript code from python types.")
+    parser.add_argument("-c", "--config", default=DEFAULT_CONFIG, help=f"config file (default: {DEFAULT_CONFIG})")
+    parser.add_argument("-j", "--jobs", type=int, help="generate the outputs in this many processes")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, help=f"skip outputs whose models didn't change since the last run, tracked in {CACHE_FILE}")
+    parser.add_argument("--write-if-changed", action=argparse.BooleanOptionalAction, help="don't rewrite files whose content didn't change")
+    parser.add_argument("--timings", action="store_true", help="print how long each output took")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    config = load_config(args.config)
+    base_dir = os.path.dirname(os.path.abspath(args.config))
+    jobs = args.jobs if args.jobs is not None else config.get("jobs", 1)
+    use_cache = args.cache if args.cache is not None else config.get("cache", False)
+    write_if_changed = args.write_if_changed if args.write_if_changed is not None else config.get("write_if_changed", False)
+    outputs = config.get("outputs", [])
+
+    cache_path = os.path.join(base_dir, CACHE_FILE)
+    cache: Dict[str, str] = {}
+    if use_cache and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as file:
+            cache = json.load(file)
+
+    task_args = [(output, base_dir, cache.get(output["path"]), write_if_changed) for output in outputs]
+    if jobs > 1 and len(outputs) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(outputs))) as executor:
+            results = list(executor.map(render_output, *zip(*task_args)))
+    else:
+        results = [render_output(*task) for task in task_args]
+
+    if use_cache:
+        with open(cache_path, "w", encoding="utf-8") as file:
+            json.dump({result.path: result.fingerprint for result in results}, file, indent=2)
+
+    if args.timings:
+        _print_timings(results, time.perf_counter() - start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
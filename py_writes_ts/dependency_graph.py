@@ -0,0 +1,177 @@
+from collections import deque
+from typing import Annotated, Any, Dict, Iterable, List, Literal, Set, get_args, get_origin, get_type_hints
+
+from py_writes_ts.class_to_interface import _is_type_alias, _is_user_defined_class, _parametrized_generic_properties, get_converter
+
+
+def is_model(py_type: Any) -> bool:
+    """
+    Returns true if the type is translated from its properties, which makes it
+    a node of the dependency graph: user defined classes and parametrizations
+    of user defined generic classes, unless a converter handles them.
+    """
+    if isinstance(py_type, str) or get_converter(py_type) is not None:
+        return False
+    origin = get_origin(py_type)
+    if origin is not None:
+        return _is_user_defined_class(origin) and hasattr(origin, "__annotations__")
+    return _is_user_defined_class(py_type)
+
+
+def model_properties(model: Any) -> Dict[str, Any]:
+    """
+    Returns the resolved type hints of a model, with the type variables of
+    parametrized generics replaced by their arguments.
+    """
+    if get_origin(model) is not None:
+        return _parametrized_generic_properties(model)
+    return get_type_hints(model)
+
+
+def referenced_models(py_type: Any) -> List[Any]:
+    """
+    Returns the models a type refers to, in order of appearance, without
+    looking inside the models themselves.
+
+    referenced_models(Dict[str, List[Room]]) -> [Room]
+    referenced_models(Optional[ResponseModel[Exit]]) -> [ResponseModel[Exit]]
+    """
+    found: List[Any] = []
+    stack = [py_type]
+    while stack:
+        current = stack.pop()
+        if is_model(current):
+            if current not in found:
+                found.append(current)
+            continue
+        if _is_type_alias(current):
+            stack.append(current.__value__)
+            continue
+        origin = get_origin(current)
+        if origin is Literal:
+            # the arguments are values, not types
+            continue
+        if origin is Annotated:
+            # only the first argument is a type, the rest is metadata
+            stack.append(get_args(current)[0])
+            continue
+        stack.extend(reversed(get_args(current)))
+    return found
+
+
+def _models_in(types: Iterable[Any]) -> List[Any]:
+    return [model for py_type in types for model in referenced_models(py_type)]
+
+
+class DependencyGraph:
+    """
+    Which models reference which, built once from their resolved type hints.
+
+    The graph contains the given models and every model reachable from them.
+    Types that are not models themselves, like `List[Room]`, start from the
+    models they reference.
+
+    :param models: The models to start from.
+    """
+
+    def __init__(self, models: Iterable[Any]) -> None:
+        self.nodes: List[Any] = []
+        self.edges: Dict[Any, List[Any]] = {}
+        self.reverse_edges: Dict[Any, List[Any]] = {}
+
+        pending = deque(_models_in(models))
+        while pending:
+            model = pending.popleft()
+            if model in self.edges:
+                continue
+            self._add_node(model)
+            dependencies: List[Any] = []
+            for property_type in model_properties(model).values():
+                for dependency in referenced_models(property_type):
+                    if dependency not in dependencies:
+                        dependencies.append(dependency)
+            self.edges[model] = dependencies
+            for dependency in dependencies:
+                self._add_node(dependency)
+                self.reverse_edges[dependency].append(model)
+                if dependency not in self.edges:
+                    pending.append(dependency)
+
+    def _add_node(self, model: Any) -> None:
+        if model not in self.reverse_edges:
+            self.nodes.append(model)
+            self.reverse_edges[model] = []
+
+    def dependencies(self, model: Any) -> List[Any]:
+        """
+        Returns the models referenced by the properties of a model.
+        """
+        return self.edges[model]
+
+    def dependents(self, model: Any) -> List[Any]:
+        """
+        Returns the models that have a property referencing a model.
+        """
+        return self.reverse_edges[model]
+
+    def reachable_from(self, roots: Iterable[Any]) -> Set[Any]:
+        """
+        Returns the models that can be reached from the roots, roots included.
+        """
+        reachable: Set[Any] = set()
+        stack = [root for root in _models_in(roots) if root in self.edges]
+        while stack:
+            model = stack.pop()
+            if model in reachable:
+                continue
+            reachable.add(model)
+            stack.extend(self.edges[model])
+        return reachable
+
+    def topological_order(self) -> List[Any]:
+        """
+        Returns every model after the models it depends on. Models in a cycle
+        keep the order in which they were found.
+        """
+        order: List[Any] = []
+        visited: Set[Any] = set()
+        for start in self.nodes:
+            if start in visited:
+                continue
+            visited.add(start)
+            stack = [(start, iter(self.edges[start]))]
+            while stack:
+                model, dependencies = stack[-1]
+                for dependency in dependencies:
+                    if dependency not in visited:
+                        visited.add(dependency)
+                        stack.append((dependency, iter(self.edges[dependency])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(model)
+        return order
+
+
+def build_dependency_graph(models: Iterable[Any]) -> DependencyGraph:
+    """
+    Build the dependency graph of some models and everything they reference.
+
+    :param models: The models to start from.
+    :return: The dependency graph.
+    """
+    return DependencyGraph(models)
+
+
+def reachable_models(models: List[Any], roots: Iterable[Any]) -> List[Any]:
+    """
+    Keep only the models that can be reached from the roots, for example the
+    request and response types of the endpoints a frontend uses.
+
+    :param models: The models that would get an interface.
+    :param roots: The types to start from.
+    :return: The reachable models, in their original order.
+    """
+    roots = list(roots)
+    reachable = build_dependency_graph(roots).reachable_from(roots)
+    return [model for model in models if model in reachable]
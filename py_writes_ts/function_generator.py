@@ -1,24 +1,412 @@
-from typing import Any, List, Tuple, Dict
+import json
+import textwrap
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Dict, get_args, get_origin
 from py_writes_ts.class_to_interface import py_type_to_ts_string, ts_name
+from py_writes_ts.dependency_graph import is_model, model_properties
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
 
 INDENT = "    "
 
+_QUERY_STRING = "new URLSearchParams(Object.entries(params as {}).map(([name, value]) => [name, String(value)]))"
+
 def generate_typescript_function(
     function_name: str,
     parameters: Dict[str, Any],
     return_type: Any,
     body: str,
     valid_refs: List[type] = [],
-    is_async: bool = False 
+    is_async: bool = False,
+    naming: Optional[NamingPolicy] = None,
+    is_generator: bool = False,
+    symbols: Optional[SymbolTable] = None,
 ) -> str:
     if return_type is None:
         return_type = "void"
-    valid_ref_names = [ts_name(ref) for ref in valid_refs]
-    params_str = f",\n{INDENT}".join([f"{name}: {py_type_to_ts_string(type_, valid_ref_names, indent=1)}" for name, type_ in parameters.items()])
-    function_def = f"""export{" async" if is_async else ""} function {function_name}(
+    valid_ref_names = {ts_name(ref, naming, symbols) for ref in valid_refs}
+    params_str = f",\n{INDENT}".join([f"{name}: {py_type_to_ts_string(type_, valid_ref_names, indent=1, naming=naming, symbols=symbols)}" for name, type_ in parameters.items()])
+    function_def = f"""export{" async" if is_async else ""} function{"*" if is_generator else ""} {function_name}(
 {INDENT}{params_str}
-): {py_type_to_ts_string(return_type, valid_ref_names)} {{\n"""
+): {py_type_to_ts_string(return_type, valid_ref_names, naming=naming, symbols=symbols)} {{\n"""
     for line in body.strip().split('\n'):
         function_def += f"{INDENT}{line}\n"
     function_def += "}\n\n"
     return function_def
+
+
+@dataclass
+class EndpointCache:
+    """
+    How the generated client caches the responses of an endpoint. Identical
+    calls in flight at the same time always share a single request.
+
+    :param ttl_ms: Milliseconds a response is reused for. 0 doesn't keep responses.
+    :param max_entries: Responses kept for the endpoint, the least recently
+                        used one is dropped first.
+    :param etag: Keep expired responses and revalidate them with If-None-Match,
+                 reusing them when the server answers 304.
+    """
+    ttl_ms: int = 0
+    max_entries: int = 100
+    etag: bool = False
+
+
+@dataclass
+class Endpoint:
+    """
+    An API endpoint that receives its parameters as a JSON body, or in the
+    query string for GET and HEAD requests, which can't have a body.
+
+    :param name: Name of the TypeScript function that calls it.
+    :param path: URL of the endpoint.
+    :param request_type: Python type of the parameters.
+    :param response_type: Python type of the response.
+    :param method: HTTP method. The parameters of GET and HEAD endpoints
+                   must be flat, they are sent as query string values.
+    :param cache: Call the endpoint through the client runtime, which
+                  deduplicates identical calls and caches responses.
+                  See `generate_client_runtime`.
+    :param stream: The endpoint streams the items of its list response as
+                   NDJSON, and its function is an async iterator over them.
+                   See `py_writes_ts.streaming`.
+    """
+    name: str
+    path: str
+    request_type: Any
+    response_type: Any
+    method: str = "POST"
+    cache: Optional[EndpointCache] = None
+    stream: bool = False
+
+
+def _fetch_statements(path: str, method: Optional[str], headers: Optional[Dict[str, str]] = None) -> str:
+    """
+    Returns the TypeScript statements that send `params` to an endpoint with
+    `fetch` and keep the result in `response`. The parameters are sent as the
+    JSON body or, for GET and HEAD requests, which can't have a body, in the
+    query string, so the parameters of those endpoints must be flat.
+
+    :param path: TypeScript expression of the URL.
+    :param method: The HTTP method, or None if it is only known at run time,
+                   in the `method` variable.
+    :param headers: The request headers, or None to send the `headers` variable.
+    """
+    if headers is None:
+        headers_ts = "headers"
+    else:
+        headers_lines = ",\n".join(f"{INDENT * 2}{json.dumps(name)}: {json.dumps(value)}" for name, value in headers.items())
+        headers_ts = f"headers: {{\n{headers_lines}\n{INDENT}}}"
+    if method is None:
+        return f"""const bodyless = method === "GET" || method === "HEAD";
+const response = await fetch(bodyless ? `${{{path}}}?${{{_QUERY_STRING}}}` : {path}, {{
+{INDENT}method,
+{INDENT}{headers_ts},
+{INDENT}body: bodyless ? undefined : JSON.stringify(params)
+}});"""
+    if method.upper() in ("GET", "HEAD"):
+        query_path = f"{path[:-1]}?${{{_QUERY_STRING}}}`" if path.endswith("`") else f"`${{{path}}}?${{{_QUERY_STRING}}}`"
+        return f"""const response = await fetch({query_path}, {{
+{INDENT}method: "{method}",
+{INDENT}{headers_ts}
+}});"""
+    return f"""const response = await fetch({path}, {{
+{INDENT}method: "{method}",
+{INDENT}{headers_ts},
+{INDENT}body: JSON.stringify(params)
+}});"""
+
+
+def generate_client_runtime() -> str:
+    """
+    Generate the runtime used by the endpoint functions of endpoints with a
+    cache. Write it once, before those functions.
+
+    Calls are identified by the endpoint and a key built from their parameters.
+    A call with the same key as one in flight waits for that one instead of
+    making its own request, and responses are kept in a LRU cache per endpoint.
+    """
+    return """interface CacheEntry {
+    data: unknown;
+    etag: string | null;
+    expires: number;
+}
+
+const inFlightRequests = new Map<string, Promise<unknown>>();
+const responseCaches = new Map<string, Map<string, CacheEntry>>();
+
+export async function cachedRequest<T>(
+    path: string,
+    method: string,
+    params: unknown,
+    key: string,
+    ttlMs: number,
+    maxEntries: number,
+    useEtag: boolean
+): Promise<T> {
+    let cache = responseCaches.get(path);
+    if (cache === undefined) {
+        cache = new Map<string, CacheEntry>();
+        responseCaches.set(path, cache);
+    }
+    const entry = cache.get(key);
+    if (entry !== undefined && entry.expires > Date.now()) {
+        // move it to the end, the most recently used position
+        cache.delete(key);
+        cache.set(key, entry);
+        return entry.data as T;
+    }
+
+    const requestKey = `${method} ${path} ${key}`;
+    const inFlight = inFlightRequests.get(requestKey);
+    if (inFlight !== undefined) {
+        return inFlight as Promise<T>;
+    }
+
+    const entries = cache;
+    const request = (async () => {
+        const headers: Record<string, string> = {
+            "Content-Type": "application/json"
+        };
+        if (useEtag && entry !== undefined && entry.etag !== null) {
+            headers["If-None-Match"] = entry.etag;
+        }
+""" + textwrap.indent(_fetch_statements("path", None), INDENT * 2) + """
+        if (response.status === 304 && entry !== undefined) {
+            entry.expires = Date.now() + ttlMs;
+            entries.delete(key);
+            entries.set(key, entry);
+            return entry.data;
+        }
+        if (!response.ok) {
+            throw new Error(`API call failed with status ${response.status}`);
+        }
+        const data: unknown = await response.json();
+        if (ttlMs > 0 || useEtag) {
+            entries.delete(key);
+            entries.set(key, { data, etag: response.headers.get("ETag"), expires: Date.now() + ttlMs });
+            if (entries.size > maxEntries) {
+                entries.delete(entries.keys().next().value as string);
+            }
+        }
+        return data;
+    })();
+    inFlightRequests.set(requestKey, request);
+    try {
+        return await request as T;
+    } finally {
+        inFlightRequests.delete(requestKey);
+    }
+}
+
+"""
+
+
+def _cache_key_expression(request_type: Any) -> str:
+    """
+    Returns the TypeScript expression that identifies a call by its `params`.
+    The properties of a model are listed in the order of its fields, so the key
+    doesn't depend on the order the caller wrote them in.
+    """
+    if is_model(request_type):
+        values = ", ".join(f"params.{prop}" for prop in model_properties(request_type))
+        return f"JSON.stringify([{values}])"
+    return "JSON.stringify(params)"
+
+
+def stream_item_type(response_type: Any) -> Any:
+    """
+    Returns the type of the items a list-returning endpoint streams.
+
+    stream_item_type(List[User]) -> User
+    stream_item_type(GetAllUsersResponse) -> User, if `users: List[User]` is its only list field
+    """
+    if get_origin(response_type) is list:
+        return get_args(response_type)[0]
+    if is_model(response_type):
+        list_fields = [t for t in model_properties(response_type).values() if get_origin(t) is list]
+        if len(list_fields) == 1:
+            return get_args(list_fields[0])[0]
+    raise ValueError(f"Only endpoints that return a list, or a class with a single list field, can be streamed, not {response_type!r}.")
+
+
+def _streaming_endpoint_function(endpoint: Endpoint, valid_refs: List[type], naming: Optional[NamingPolicy], symbols: Optional[SymbolTable]) -> str:
+    valid_ref_names = {ts_name(ref, naming, symbols) for ref in valid_refs}
+    item_ts = py_type_to_ts_string(stream_item_type(endpoint.response_type), valid_ref_names, naming=naming, symbols=symbols)
+    fetch_ts = _fetch_statements(f"`{endpoint.path}`", endpoint.method, {"Content-Type": "application/json", "Accept": "application/x-ndjson"})
+    body = f"""
+{fetch_ts}
+
+if (!response.ok || response.body === null) {{
+    throw new Error(`API call failed with status ${{response.status}}`);
+}}
+
+// parse each line as soon as it is complete
+const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+let buffer = "";
+while (true) {{
+    const {{ done, value }} = await reader.read();
+    if (done) {{
+        break;
+    }}
+    buffer += value;
+    const lines = buffer.split("\\n");
+    buffer = lines.pop()!;
+    for (const line of lines) {{
+        if (line.trim() !== "") {{
+            const item: {item_ts} = JSON.parse(line);
+            yield item;
+        }}
+    }}
+}}
+if (buffer.trim() !== "") {{
+    const item: {item_ts} = JSON.parse(buffer);
+    yield item;
+}}
+"""
+    return generate_typescript_function(
+        function_name=endpoint.name,
+        parameters={"params": endpoint.request_type},
+        return_type=f"AsyncGenerator<{item_ts}, void, undefined>",
+        body=body,
+        valid_refs=valid_refs,
+        is_async=True,
+        naming=naming,
+        is_generator=True,
+        symbols=symbols,
+    )
+
+
+def generate_endpoint_function(
+    endpoint: Endpoint,
+    valid_refs: List[type] = [],
+    naming: Optional[NamingPolicy] = None,
+    symbols: Optional[SymbolTable] = None,
+) -> str:
+    """
+    Generate an async TypeScript function that calls an endpoint with `fetch`,
+    or through the client runtime if the endpoint has a cache. Streaming
+    endpoints get an async generator that yields each item as it arrives.
+
+    :param endpoint: The endpoint to call.
+    :param valid_refs: Classes that can be referenced by their interface name.
+    :param naming: Naming policy for the referenced interfaces.
+    :param symbols: Symbol table the interfaces were named with, see
+                    `generate_typescript_interfaces`.
+    :return: The TypeScript function.
+    """
+    if endpoint.stream:
+        return _streaming_endpoint_function(endpoint, valid_refs, naming, symbols)
+    valid_ref_names = {ts_name(ref, naming, symbols) for ref in valid_refs}
+    response_ts = py_type_to_ts_string(endpoint.response_type, valid_ref_names, naming=naming, symbols=symbols)
+    if endpoint.cache is not None:
+        cache = endpoint.cache
+        body = (
+            f"return cachedRequest<{response_ts}>(`{endpoint.path}`, \"{endpoint.method}\", params, "
+            f"{_cache_key_expression(endpoint.request_type)}, {cache.ttl_ms}, {cache.max_entries}, {'true' if cache.etag else 'false'});"
+        )
+    else:
+        fetch_ts = _fetch_statements(f"`{endpoint.path}`", endpoint.method, {"Content-Type": "application/json"})
+        body = f"""
+{fetch_ts}
+
+if (!response.ok) {{
+    throw new Error(`API call failed with status ${{response.status}}`);
+}}
+
+const data: {response_ts} = await response.json();
+return data;
+"""
+    return generate_typescript_function(
+        function_name=endpoint.name,
+        parameters={"params": endpoint.request_type},
+        return_type=f"Promise<{response_ts}>",
+        body=body,
+        valid_refs=valid_refs,
+        is_async=True,
+        naming=naming,
+        symbols=symbols,
+    )
+
+
+def generate_endpoint_table(
+    endpoints: List[Endpoint],
+    valid_refs: List[type] = [],
+    naming: Optional[NamingPolicy] = None,
+    wrappers: bool = True,
+    symbols: Optional[SymbolTable] = None,
+) -> str:
+    """
+    Generate a table-driven client: an `Api` interface that maps each endpoint
+    name to its request and response types, the path and method of each one,
+    and a single `call` function that calls any endpoint with the right types:
+
+        const user = await call("getUserById", { id: 1 });
+
+    Much smaller than a full function per endpoint. Endpoints with a cache go
+    through the client runtime, see `generate_client_runtime`, keyed like in
+    `generate_endpoint_function`. Streaming endpoints need their own function, see
+    `generate_endpoint_function`.
+
+    :param endpoints: The endpoints of the API.
+    :param valid_refs: Classes that can be referenced by their interface name.
+    :param naming: Naming policy for the referenced interfaces.
+    :param wrappers: Also write a one line function per endpoint, named like
+                     the endpoint, that calls `call`.
+    :param symbols: Symbol table the interfaces were named with, see
+                    `generate_typescript_interfaces`.
+    :return: The TypeScript code of the client.
+    """
+    valid_ref_names = {ts_name(ref, naming, symbols) for ref in valid_refs}
+    api_lines = []
+    route_lines = []
+    for endpoint in endpoints:
+        if endpoint.stream:
+            raise ValueError(f"The streaming endpoint {endpoint.name} can't be called through the endpoint table, generate its function with generate_endpoint_function.")
+        request_ts = py_type_to_ts_string(endpoint.request_type, valid_ref_names, indent=1, naming=naming, symbols=symbols)
+        response_ts = py_type_to_ts_string(endpoint.response_type, valid_ref_names, indent=1, naming=naming, symbols=symbols)
+        api_lines.append(f"{INDENT}{endpoint.name}: [{request_ts}, {response_ts}];\n")
+        cache = endpoint.cache
+        cache_ts = ""
+        if cache is not None:
+            # the same key as the endpoint functions, so both clients share entries the same way
+            cache_ts = f", [(params) => {_cache_key_expression(endpoint.request_type)}, {cache.ttl_ms}, {cache.max_entries}, {'true' if cache.etag else 'false'}]"
+        route_lines.append(f"{INDENT}{endpoint.name}: [`{endpoint.path}`, \"{endpoint.method}\"{cache_ts}],\n")
+
+    cached = any(endpoint.cache is not None for endpoint in endpoints)
+    if cached:
+        route_type = "// path, method and, for cached endpoints, [key, ttlMs, maxEntries, useEtag]\ntype Route = [string, string, [(params: any) => string, number, number, boolean]?];"
+        dispatch = """const [path, method, cache] = routes[endpoint];
+    if (cache !== undefined) {
+        const [key, ...options] = cache;
+        return cachedRequest<Api[K][1]>(path, method, params, key(params), ...options);
+    }"""
+    else:
+        route_type = "// path and method\ntype Route = [string, string];"
+        dispatch = "const [path, method] = routes[endpoint];"
+    fetch_ts = textwrap.indent(_fetch_statements("path", None, {"Content-Type": "application/json"}), INDENT)
+    code = f"""export interface Api {{
+{''.join(api_lines)}}}
+
+{route_type}
+
+const routes: Record<keyof Api, Route> = {{
+{''.join(route_lines)}}};
+
+export async function call<K extends keyof Api>(endpoint: K, params: Api[K][0]): Promise<Api[K][1]> {{
+    {dispatch}
+{fetch_ts}
+
+    if (!response.ok) {{
+        throw new Error(`API call failed with status ${{response.status}}`);
+    }}
+
+    return await response.json();
+}}
+
+"""
+    if wrappers:
+        for endpoint in endpoints:
+            code += f"export const {endpoint.name} = (params: Api[\"{endpoint.name}\"][0]) => call(\"{endpoint.name}\", params);\n"
+        code += "\n"
+    return code
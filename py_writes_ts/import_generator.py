@@ -1,16 +1,63 @@
-from typing import List
+from typing import Any, Collection, List, Optional
 
-def generate_typescript_import(module_name: str, imports: List[str]) -> str:
+from py_writes_ts.class_to_interface import ts_name
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+
+def generate_typescript_import(module_name: str, imports: List[str], type_only: bool = False, type_names: Collection[str] = ()) -> str:
     """
     Generate a TypeScript import statement.
 
+    Type-only imports are erased from the JavaScript output, also by bundlers
+    that compile each file on its own (`isolatedModules` and
+    `verbatimModuleSyntax`), so the imported module doesn't need to be kept
+    or analyzed.
+
     :param module_name: The name of the module to import from.
     :param imports: A list of items to import from the module.
+    :param type_only: Import every item as a type: `import type { ... }`.
+    :param type_names: Items that are only types. If all of them are, it is
+                       the same as `type_only`, otherwise they are marked
+                       one by one: `import { value, type Type }`.
     :return: A TypeScript import statement as a string.
     """
     if not imports:
         raise ValueError("The imports list cannot be empty.")
-    
+
+    if type_only or all(item in type_names for item in imports):
+        return f"import type {{ {', '.join(imports)} }} from '{module_name}';\n"
+
     # Create the import statement
-    import_items = ", ".join(imports)
+    import_items = ", ".join(f"type {item}" if item in type_names else item for item in imports)
     return f"import {{ {import_items} }} from '{module_name}';\n"
+
+
+def generate_typescript_type_import(module_name: str, py_types: List[Any], naming: Optional[NamingPolicy] = None, symbols: Optional[SymbolTable] = None) -> str:
+    """
+    Generate an `import type` of the interfaces of some python types, for
+    example to use in one file the interfaces generated in another one.
+
+    :param module_name: The name of the module to import from.
+    :param py_types: The python types whose interfaces are imported.
+    :param naming: The naming policy the interfaces were generated with.
+    :param symbols: The symbol table the interfaces were named with.
+    :return: A TypeScript import statement as a string.
+    """
+    names = [ts_name(py_type, naming, symbols).split("<")[0] for py_type in py_types]
+    return generate_typescript_import(module_name, list(dict.fromkeys(names)), type_only=True)
+
+
+def generate_typescript_export(module_name: str, exports: List[str], type_only: bool = False) -> str:
+    """
+    Generate a TypeScript re-export statement.
+
+    :param module_name: The name of the module to export from.
+    :param exports: A list of items to re-export.
+    :param type_only: Re-export them as types, `export type { ... }`, which is
+                      erased from the JavaScript output.
+    :return: A TypeScript export statement as a string.
+    """
+    if not exports:
+        raise ValueError("The exports list cannot be empty.")
+
+    return f"export{' type' if type_only else ''} {{ {', '.join(exports)} }} from '{module_name}';\n"
@@ -0,0 +1,108 @@
+"""
+Python values to JSON and back, the way the generated TypeScript types expect
+them: dates, times, UUIDs and decimals are strings, like the converters
+translate them, and enums are their values.
+"""
+import collections.abc
+import dataclasses
+import datetime
+import decimal
+import enum
+import types
+import uuid
+from typing import Annotated, Any, Callable, Dict, Union, get_args, get_origin
+
+from py_writes_ts.class_to_interface import _is_type_alias
+from py_writes_ts.dependency_graph import is_model, model_properties
+
+_PARSERS: Dict[Any, Callable[[str], Any]] = {
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+    datetime.time: datetime.time.fromisoformat,
+    uuid.UUID: uuid.UUID,
+    decimal.Decimal: decimal.Decimal,
+}
+
+_ARRAYS = (list, set, frozenset, collections.abc.Sequence, collections.abc.MutableSequence,
+           collections.abc.Set, collections.abc.MutableSet, collections.abc.Iterable, collections.abc.Collection)
+
+_MAPPINGS = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def to_json(value: Any) -> Any:
+    """
+    Returns a value ready for `json.dumps`: dataclasses, and the ones nested in
+    them, become dicts, pydantic models are dumped in their JSON mode and dates,
+    times, UUIDs, decimals and enums become their JSON values.
+
+    :param value: The value to send.
+    :return: Only dicts, lists, strings, numbers, booleans and None.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value.value if isinstance(value, enum.Enum) else value
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: to_json(getattr(value, field.name)) for field in dataclasses.fields(value)}
+    if hasattr(value, "model_dump"):
+        # pydantic models
+        return value.model_dump(mode="json")
+    if isinstance(value, enum.Enum):
+        return to_json(value.value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        # datetime is a date too
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_json(item) for item in value]
+    return value
+
+
+def from_json(py_type: Any, value: Any) -> Any:
+    """
+    Build a value of a type from its JSON, the reverse of `to_json`: the
+    dataclasses nested in it are built too, and the values sent as strings,
+    like dates, are parsed.
+
+    :param py_type: The type of the value.
+    :param value: The decoded JSON.
+    :return: The value.
+    """
+    if value is None:
+        return None
+    if hasattr(py_type, "model_validate"):
+        # pydantic models, which build their nested models themselves
+        return py_type.model_validate(value)
+    if _is_type_alias(py_type):
+        return from_json(py_type.__value__, value)
+    origin = get_origin(py_type)
+    args = get_args(py_type)
+    if is_model(py_type):
+        model_class = origin or py_type
+        if isinstance(model_class, type) and dataclasses.is_dataclass(model_class) and isinstance(value, dict):
+            properties = model_properties(py_type)
+            return model_class(**{name: from_json(properties.get(name, Any), item) for name, item in value.items()})
+        return value
+    if origin is Annotated:
+        return from_json(args[0], value)
+    if origin in (Union, types.UnionType):
+        non_none_args = [arg for arg in args if arg is not type(None)]
+        # only a single type tells what to build
+        return from_json(non_none_args[0], value) if len(non_none_args) == 1 else value
+    if origin is tuple and isinstance(value, list):
+        if len(args) == 2 and args[1] is Ellipsis:
+            return tuple(from_json(args[0], item) for item in value)
+        return tuple(from_json(arg, item) for arg, item in zip(args, value))
+    if origin in _ARRAYS and isinstance(value, list):
+        items = [from_json(args[0] if args else Any, item) for item in value]
+        return origin(items) if origin in (set, frozenset) else items
+    if origin in _MAPPINGS and isinstance(value, dict):
+        value_type = args[1] if args else Any
+        return {key: from_json(value_type, item) for key, item in value.items()}
+    if isinstance(py_type, enum.EnumMeta):
+        return py_type(value)
+    parser = _PARSERS.get(py_type)
+    if parser is not None and isinstance(value, str):
+        return parser(value)
+    return value
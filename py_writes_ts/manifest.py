@@ -0,0 +1,311 @@
+"""
+Type manifest: the resolved model graph as JSON, so the TypeScript code can be
+generated without importing the backend.
+
+`export_manifest` runs in the backend and walks the models once. Elsewhere,
+`load_manifest` rebuilds equivalent python types from the manifest alone and
+`render_manifest` generates the same interfaces `generate_typescript_interfaces`
+would generate from the original types.
+
+    {
+        "version": 1,
+        "models": {
+            "app.models:User": {"kind": "class", "name": "User", "params": [], "fields": {"id": "int"}},
+            "app.models:Color": {"kind": "enum", "name": "Color", "members": [["RED", "red"]]},
+            "app.models:Payload": {"kind": "alias", "name": "Payload", "value": ...}
+        },
+        "types": [{"ref": "app.models:User"}],
+        "aliases": {"UserList": {"origin": "list", "args": [{"ref": "app.models:User"}]}}
+    }
+
+Type expressions are:
+- The name of a basic type: "str", "int", "datetime"... and "..." in tuples.
+- `{"ref": id, "args": [...]}`: a class, enum or `type X = ...` alias of the
+  models, parametrized if it has arguments.
+- `{"origin": "list", "args": [...]}`: a parametrized built-in type such as
+  list, dict, tuple, Union or Literal. The arguments of Literal are values, or
+  `{"enum": id, "member": name}` for enum members. Without "args", the bare type.
+- `{"typevar": "D"}`: a type parameter of the generic class being described.
+- `{"ts": "..."}`: TypeScript code, for the types that are translated by a
+  custom converter.
+"""
+import collections.abc
+import datetime
+import decimal
+import enum
+import types
+import uuid
+from dataclasses import dataclass
+from typing import Annotated, Any, Callable, Dict, Generic, List, Literal, Optional, Tuple, TypeVar, Union, cast, get_args, get_origin, get_type_hints
+
+from py_writes_ts.class_to_interface import (
+    _TYPE_ALIAS_TYPES,
+    ConversionContext,
+    _is_type_alias,
+    generate_typescript_interfaces,
+    py_type_to_ts_string,
+    register_converter,
+)
+from py_writes_ts.dependency_graph import is_model
+
+MANIFEST_VERSION = 1
+
+_BASIC_TYPES: Dict[str, Any] = {
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "None": None,
+    "Any": Any,
+    "bytes": bytes,
+    "datetime": datetime.datetime,
+    "date": datetime.date,
+    "time": datetime.time,
+    "UUID": uuid.UUID,
+    "Decimal": decimal.Decimal,
+    "...": Ellipsis,
+}
+
+_ORIGINS: Dict[str, Any] = {
+    "list": list,
+    "set": set,
+    "frozenset": frozenset,
+    "tuple": tuple,
+    "dict": dict,
+    "Union": Union,
+    "Literal": Literal,
+    "Sequence": collections.abc.Sequence,
+    "MutableSequence": collections.abc.MutableSequence,
+    "Set": collections.abc.Set,
+    "MutableSet": collections.abc.MutableSet,
+    "Iterable": collections.abc.Iterable,
+    "Collection": collections.abc.Collection,
+    "Mapping": collections.abc.Mapping,
+    "MutableMapping": collections.abc.MutableMapping,
+}
+
+
+class _TypeScriptCode:
+    """
+    Base of the classes that stand for the TypeScript code of a type in the
+    rebuilt models. Plain strings can't be used: the type hints would take
+    them for forward references.
+    """
+    typescript = "any"
+
+
+@register_converter(_TypeScriptCode)
+def _convert_typescript_code(py_type: Any, context: ConversionContext, indent: int) -> str:
+    return py_type.typescript
+
+
+def _model_id(py_type: Any) -> str:
+    return f"{py_type.__module__}:{py_type.__qualname__}"
+
+
+class _Exporter:
+    def __init__(self) -> None:
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.pending: List[Any] = []
+
+    def ref(self, py_type: Any) -> str:
+        model_id = _model_id(py_type)
+        if model_id not in self.models:
+            # filled in by `describe`, the placeholder stops cycles
+            self.models[model_id] = {}
+            self.pending.append(py_type)
+        return model_id
+
+    def describe(self, py_type: Any) -> Dict[str, Any]:
+        if isinstance(py_type, enum.EnumMeta):
+            members: List[List[Any]] = []
+            member: enum.Enum
+            for name, member in py_type.__members__.items():
+                if not isinstance(member.value, (str, int, float, bool, type(None))):
+                    raise ValueError(f"{py_type.__name__}.{name} has a value that can't be written to a manifest.")
+                members.append([name, member.value])
+            return {"kind": "enum", "name": py_type.__name__, "members": members}
+        if _is_type_alias(py_type):
+            return {"kind": "alias", "name": py_type.__name__, "value": self.expression(py_type.__value__)}
+        return {
+            "kind": "class",
+            "name": py_type.__name__,
+            "params": [param.__name__ for param in getattr(py_type, "__parameters__", ())],
+            "fields": {name: self.expression(hint) for name, hint in get_type_hints(py_type).items()},
+        }
+
+    def literal_value(self, value: Any) -> Any:
+        if isinstance(value, enum.Enum):
+            return {"enum": self.ref(type(value)), "member": value.name}
+        if not isinstance(value, (str, int, float, bool, type(None))):
+            raise ValueError(f"The literal value {value!r} can't be written to a manifest.")
+        return value
+
+    def expression(self, py_type: Any) -> Any:
+        if isinstance(py_type, str):
+            return {"ts": py_type}
+        if py_type is type(None):
+            return "None"
+        for name, basic_type in _BASIC_TYPES.items():
+            if py_type is basic_type:
+                return name
+        if isinstance(py_type, TypeVar):
+            return {"typevar": py_type.__name__}
+        if isinstance(py_type, enum.EnumMeta) or _is_type_alias(py_type):
+            return {"ref": self.ref(py_type)}
+        if is_model(py_type):
+            origin = get_origin(py_type)
+            if origin is None:
+                return {"ref": self.ref(py_type)}
+            return {"ref": self.ref(origin), "args": [self.expression(arg) for arg in get_args(py_type)]}
+
+        origin = get_origin(py_type)
+        if origin is Annotated:
+            return self.expression(get_args(py_type)[0])
+        if origin is types.UnionType:
+            origin = Union
+        if origin is Literal:
+            return {"origin": "Literal", "args": [self.literal_value(arg) for arg in get_args(py_type)]}
+        for name, known_origin in _ORIGINS.items():
+            if py_type is known_origin:
+                return {"origin": name}
+            if origin is known_origin:
+                # Tuple[()] has empty arguments, bare typing.List has none
+                args = getattr(py_type, "__args__", None)
+                if args is None:
+                    return {"origin": name}
+                return {"origin": name, "args": [self.expression(arg) for arg in args]}
+        # translated by a converter, there is no python type to rebuild
+        return {"ts": py_type_to_ts_string(py_type, [])}
+
+
+def export_manifest(py_types: List[Any], type_aliases: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Describe a list of types, and every model they reference, as JSON.
+
+    :param py_types: The types that would be given to `generate_typescript_interfaces`.
+    :param type_aliases: The type aliases, by name, see `find_type_aliases`.
+    :return: The manifest, ready for `json.dump`.
+    """
+    exporter = _Exporter()
+    manifest_types = [exporter.expression(py_type) for py_type in py_types]
+    aliases = {name: exporter.expression(py_type) for name, py_type in (type_aliases or {}).items()}
+    while exporter.pending:
+        py_type = exporter.pending.pop(0)
+        exporter.models[_model_id(py_type)] = exporter.describe(py_type)
+    return {
+        "version": MANIFEST_VERSION,
+        "models": exporter.models,
+        "types": manifest_types,
+        "aliases": aliases,
+    }
+
+
+@dataclass
+class LoadedManifest:
+    """
+    Python types rebuilt from a manifest. They only have the type hints, but
+    they are translated to the same TypeScript as the originals.
+
+    :param types: The types the manifest was exported from.
+    :param type_aliases: The type aliases, by name.
+    :param models: Every class, enum and alias of the manifest, by
+                   `module:Name`, for instance to build a naming policy.
+    """
+    types: List[Any]
+    type_aliases: Dict[str, Any]
+    models: Dict[str, Any]
+
+
+def _make_type_alias(name: str, value: Any) -> Any:
+    if not _TYPE_ALIAS_TYPES:
+        raise ValueError(f"The manifest has the type alias {name}, which needs python 3.12 or typing_extensions.")
+    return _TYPE_ALIAS_TYPES[0](name, value)
+
+
+def _class_body(module: str, qualname: str) -> Callable[[Dict[str, Any]], None]:
+    def exec_body(namespace: Dict[str, Any]) -> None:
+        namespace.update({"__module__": module, "__qualname__": qualname})
+    return exec_body
+
+
+def load_manifest(manifest: Dict[str, Any]) -> LoadedManifest:
+    """
+    Rebuild the types of a manifest made with `export_manifest`.
+
+    :param manifest: The decoded JSON manifest.
+    :return: The rebuilt types.
+    """
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version: {manifest.get('version')!r}.")
+    descriptions: Dict[str, Dict[str, Any]] = manifest["models"]
+    models: Dict[str, Any] = {}
+    type_params: Dict[str, Dict[str, Any]] = {}
+    typescript_types: Dict[str, Any] = {}
+
+    # Create the classes and enums first, so fields can reference any of them
+    for model_id, description in descriptions.items():
+        module, _, qualname = model_id.partition(":")
+        if description["kind"] == "enum":
+            models[model_id] = enum.Enum(description["name"], [tuple(member) for member in description["members"]], module=module, qualname=qualname)
+        elif description["kind"] == "class":
+            params = {param: TypeVar(param) for param in description["params"]}
+            # Generic is only indexed with literal type variables as far as mypy knows
+            bases: Tuple[Any, ...] = (cast(Any, Generic)[tuple(params.values())],) if params else ()
+            models[model_id] = types.new_class(description["name"], bases, exec_body=_class_body(module, qualname))
+            type_params[model_id] = params
+
+    def expression(value: Any, params: Dict[str, Any]) -> Any:
+        if isinstance(value, str):
+            return _BASIC_TYPES[value]
+        if "ts" in value:
+            code = value["ts"]
+            if code not in typescript_types:
+                typescript_types[code] = type("TypeScriptCode", (_TypeScriptCode,), {"typescript": code})
+            return typescript_types[code]
+        if "typevar" in value:
+            return params[value["typevar"]]
+        if "ref" in value:
+            model = models.get(value["ref"])
+            if model is None:
+                # an alias referenced before it was built
+                description = descriptions[value["ref"]]
+                model = models[value["ref"]] = _make_type_alias(description["name"], expression(description["value"], {}))
+            if "args" in value:
+                return model[tuple(expression(arg, params) for arg in value["args"])]
+            return model
+        origin = _ORIGINS[value["origin"]]
+        if "args" not in value:
+            return origin
+        if origin is Literal:
+            values = [models[arg["enum"]][arg["member"]] if isinstance(arg, dict) else arg for arg in value["args"]]
+            return Literal[tuple(values)]
+        return origin[tuple(expression(arg, params) for arg in value["args"])]
+
+    for model_id, description in descriptions.items():
+        if description["kind"] == "class":
+            models[model_id].__annotations__ = {
+                name: expression(field, type_params[model_id]) for name, field in description["fields"].items()
+            }
+        elif description["kind"] == "alias":
+            expression({"ref": model_id}, {})
+
+    return LoadedManifest(
+        types=[expression(value, {}) for value in manifest["types"]],
+        type_aliases={name: expression(value, {}) for name, value in manifest["aliases"].items()},
+        models=models,
+    )
+
+
+def render_manifest(manifest: Dict[str, Any], **interface_options: Any) -> str:
+    """
+    Generate the TypeScript interfaces of a manifest, as
+    `generate_typescript_interfaces` would for the original types.
+
+    :param manifest: The decoded JSON manifest.
+    :param interface_options: Keyword arguments for `generate_typescript_interfaces`.
+    :return: A string with all TypeScript interfaces.
+    """
+    loaded = load_manifest(manifest)
+    interface_options.setdefault("type_aliases", loaded.type_aliases)
+    return generate_typescript_interfaces(loaded.types, **interface_options)
@@ -0,0 +1,58 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Literal, get_args, get_origin
+
+
+@dataclass
+class NamingPolicy:
+    """
+    Decides the TypeScript name of each python type when the code is written,
+    so there is no need to rename the interfaces afterwards.
+
+    - Types in `renames` get exactly that name.
+    - Other names get the prefix and the suffix: User -> IUserDto
+    - Parametrized generics join the names of their arguments and of their
+      generic class, renamed if they are in `renames`, and get the prefix and
+      the suffix once: ResponseModel[User] -> IUserDtoResponseModelDto
+      (with `generic_args="after"`, IResponseModelUserDto).
+    - Unparametrized generics keep their type parameters, even if renamed:
+      IResponseModelDto<D>
+
+    :param renames: Names for specific python types.
+    :param prefix: Prepended to every name that isn't in `renames`.
+    :param suffix: Appended to every name that isn't in `renames`.
+    :param generic_args: Whether the argument names of a parametrized generic
+                         go "before" or "after" the name of the generic class.
+    """
+    renames: Dict[Any, str] = field(default_factory=dict)
+    prefix: str = ""
+    suffix: str = ""
+    generic_args: Literal["before", "after"] = "before"
+    _names: Dict[Any, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def name(self, py_type: Any) -> str:
+        """
+        Returns the TypeScript name of a python type.
+        """
+        name = self._names.get(py_type)
+        if name is None:
+            name = self._names[py_type] = self._name(py_type)
+        return name
+
+    def _name(self, py_type: Any) -> str:
+        type_params = getattr(py_type, "__parameters__", ())
+        params_names = f"<{', '.join(p.__name__ for p in type_params)}>" if get_origin(py_type) is None and type_params else ""
+        if py_type in self.renames:
+            return f"{self.renames[py_type]}{params_names}"
+        return f"{self.prefix}{self._base_name(py_type)}{self.suffix}{params_names}"
+
+    def _base_name(self, py_type: Any) -> str:
+        if py_type in self.renames:
+            return self.renames[py_type]
+        origin = get_origin(py_type)
+        if origin is None:
+            return py_type.__name__
+        args_names = "".join(self._base_name(arg) for arg in get_args(py_type))
+        origin_name = self._base_name(origin)
+        if self.generic_args == "after":
+            return f"{origin_name}{args_names}"
+        return f"{args_names}{origin_name}"
@@ -7,6 +7,11 @@ def rename_interfaces(code: str, substitutions: Dict[Any, str]) -> str:
     Substitutes all exact (standalone) occurrences of each key in 'substitutions'
     with the corresponding value, treating them like TypeScript identifiers.
 
+    This is an extra pass over already generated code. Prefer passing a
+    `NamingPolicy` to the generators, which names the interfaces as they are
+    written and also renames the names built from them, like those of
+    parametrized generics.
+
     :param code: The original TypeScript code.
     :param substitutions: A dictionary where each key is the python type
                           and each value is the new interface/name.
@@ -0,0 +1,197 @@
+"""
+Revivers turn the values JSON can't represent, like dates, back into their
+TypeScript types after `JSON.parse`.
+
+Instead of walking every parsed value, each interface gets a function written
+for its type, which only visits the properties that hold something to
+convert, in place:
+
+    export function reviveEvent(data: any): Event {
+        data.starts_at = new Date(data.starts_at);
+        for (let i0 = 0; i0 < data.attendees.length; i0++) {
+            reviveUser(data.attendees[i0]);
+        }
+        return data;
+    }
+
+Generate the interfaces with `ts_types=reviver_ts_types()` so their
+properties have the revived types (`starts_at: Date`).
+"""
+import collections.abc
+import datetime
+import types
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union, get_args, get_origin
+
+from py_writes_ts.class_to_interface import _is_generic, _is_type_alias, ts_name
+from py_writes_ts.dependency_graph import build_dependency_graph, is_model, model_properties
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+
+INDENT = "    "
+
+_MAPPINGS = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+@dataclass(frozen=True)
+class Reviver:
+    """
+    How a python type is revived.
+
+    :param ts_type: The TypeScript type of the revived value.
+    :param expression: TypeScript expression that revives the JSON value,
+                       written in place of `{value}`.
+    """
+    ts_type: str
+    expression: str
+
+
+# Decimal is left as a string: a number would lose the precision it is used for,
+# give it a reviver with a decimal library of your choice
+DEFAULT_REVIVERS: Dict[Any, Reviver] = {
+    datetime.datetime: Reviver("Date", "new Date({value})"),
+    datetime.date: Reviver("Date", "new Date({value})"),
+}
+
+
+def reviver_ts_types(revivers: Optional[Dict[Any, Reviver]] = None) -> Dict[Any, str]:
+    """
+    Returns the TypeScript type of each revived python type, for the `ts_types`
+    parameter of `generate_typescript_interfaces`.
+    """
+    return {py_type: reviver.ts_type for py_type, reviver in (revivers or DEFAULT_REVIVERS).items()}
+
+
+def _nested_types(py_type: Any) -> List[Any]:
+    """
+    Returns the types a type is made of, without looking inside models.
+    """
+    if is_model(py_type):
+        return []
+    if _is_type_alias(py_type):
+        return [py_type.__value__]
+    origin = get_origin(py_type)
+    if origin is Literal:
+        # the arguments are values, not types
+        return []
+    if origin is Annotated:
+        return [get_args(py_type)[0]]
+    return [arg for arg in get_args(py_type) if arg is not Ellipsis]
+
+
+class _ReviverWriter:
+    def __init__(self, py_types: List[Any], revivers: Dict[Any, Reviver], naming: Optional[NamingPolicy], symbols: Optional[SymbolTable]) -> None:
+        self.revivers = revivers
+        self.naming = naming
+        self.symbols = symbols
+        self.graph = build_dependency_graph(py_types)
+        # models whose own properties hold something to revive
+        pending = [model for model in self.graph.nodes if any(self._has_revived_leaf(t) for t in model_properties(model).values())]
+        # and the models that reference them
+        self.needs_reviver = set(pending)
+        while pending:
+            for dependent in self.graph.dependents(pending.pop()):
+                if dependent not in self.needs_reviver:
+                    self.needs_reviver.add(dependent)
+                    pending.append(dependent)
+        self.functions = {
+            py_type: f"revive{ts_name(py_type, naming, symbols)}"
+            for py_type in py_types
+            if is_model(py_type) and not _is_generic(py_type) and py_type in self.needs_reviver
+        }
+        # the models being revived inline, to find the ones that contain themselves
+        self.inlining: List[Any] = []
+
+    def _has_revived_leaf(self, py_type: Any) -> bool:
+        stack = [py_type]
+        while stack:
+            current = stack.pop()
+            if current in self.revivers:
+                return True
+            stack.extend(_nested_types(current))
+        return False
+
+    def needs(self, py_type: Any) -> bool:
+        if is_model(py_type):
+            return py_type in self.needs_reviver
+        return py_type in self.revivers or any(self.needs(t) for t in _nested_types(py_type))
+
+    def lines(self, py_type: Any, target: str, depth: int) -> List[str]:
+        """
+        Returns the statements that revive the value of a type at `target`.
+        """
+        if not self.needs(py_type):
+            return []
+        if py_type in self.revivers:
+            return [f"{target} = {self.revivers[py_type].expression.format(value=target)};"]
+        if py_type in self.functions:
+            return [f"{self.functions[py_type]}({target});"]
+        if is_model(py_type):
+            # written inline, like in the interface
+            if py_type in self.inlining:
+                cycle = [*self.inlining[self.inlining.index(py_type):], py_type]
+                names = " -> ".join(ts_name(model, self.naming) for model in cycle)
+                raise ValueError(f"{ts_name(py_type, self.naming)} references itself ({names}), so it can't be revived inline. Add it to py_types.")
+            self.inlining.append(py_type)
+            try:
+                return self.properties_lines(py_type, target, depth)
+            finally:
+                self.inlining.pop()
+
+        origin = get_origin(py_type)
+        args = get_args(py_type)
+        if _is_type_alias(py_type) or origin is Annotated:
+            return self.lines(_nested_types(py_type)[0], target, depth)
+        if origin in (Union, types.UnionType):
+            non_none_args = [arg for arg in args if arg is not type(None)]
+            if len(non_none_args) > 1:
+                raise ValueError(f"Can't tell which type of {py_type!r} a value has, so it can't be revived.")
+            nested = self.lines(non_none_args[0], target, depth)
+            if len(non_none_args) == len(args):
+                return nested
+            return [f"if ({target} != null) {{", *_indented(nested), "}"]
+        if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+            return [line for index, arg in enumerate(args) for line in self.lines(arg, f"{target}[{index}]", depth)]
+        if origin in _MAPPINGS:
+            key = f"k{depth}"
+            nested = self.lines(args[1], f"{target}[{key}]", depth + 1)
+            return [f"for (const {key} in {target}) {{", *_indented(nested), "}"]
+        # arrays: lists, sets, sequences and tuples of any length
+        index = f"i{depth}"
+        nested = self.lines(args[0], f"{target}[{index}]", depth + 1)
+        return [f"for (let {index} = 0; {index} < {target}.length; {index}++) {{", *_indented(nested), "}"]
+
+    def properties_lines(self, model: Any, target: str, depth: int) -> List[str]:
+        return [line for prop, prop_type in model_properties(model).items() for line in self.lines(prop_type, f"{target}.{prop}", depth)]
+
+    def function(self, py_type: Any) -> str:
+        body = "".join(f"{INDENT}{line}\n" for line in self.properties_lines(py_type, "data", 0))
+        return f"export function {self.functions[py_type]}(data: any): {ts_name(py_type, self.naming, self.symbols)} {{\n{body}{INDENT}return data;\n}}\n"
+
+
+def _indented(lines: List[str]) -> List[str]:
+    return [f"{INDENT}{line}" for line in lines]
+
+
+def generate_typescript_revivers(
+    py_types: List[Any],
+    revivers: Optional[Dict[Any, Reviver]] = None,
+    naming: Optional[NamingPolicy] = None,
+    symbols: Optional[SymbolTable] = None,
+) -> str:
+    """
+    Generate a reviver function for each class of `py_types` that has
+    something to revive, directly or in the classes it references. Classes
+    without one can be used as parsed.
+
+    :param py_types: The classes that get an interface.
+    :param revivers: How each python type is revived, `DEFAULT_REVIVERS` by
+                     default: dates become `Date`.
+    :param naming: Naming policy of the interfaces.
+    :param symbols: Symbol table the interfaces were named with.
+    :return: The TypeScript functions.
+    :raises ValueError: If a class that isn't in `py_types`, so it is revived
+                        inline, contains itself.
+    """
+    writer = _ReviverWriter(py_types, revivers or DEFAULT_REVIVERS, naming, symbols)
+    return "\n".join(writer.function(py_type) for py_type in writer.functions)
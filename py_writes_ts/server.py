@@ -0,0 +1,243 @@
+import asyncio
+import enum
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union, get_args, get_origin
+
+from py_writes_ts.class_to_interface import _is_type_alias, generate_typescript_interfaces
+from py_writes_ts.dependency_graph import build_dependency_graph, model_properties
+from py_writes_ts.function_generator import generate_typescript_function
+from py_writes_ts.symbols import SymbolTable
+
+CONTENT_TYPE = "application/typescript; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class RenderedSdk:
+    """
+    A generated TypeScript SDK.
+
+    :param code: The TypeScript code.
+    :param etag: Strong ETag of the code, quoted and ready to be used as a header.
+    :param fingerprint: Fingerprint of the models and functions the code was generated from.
+    """
+    code: str
+    etag: str
+    fingerprint: str
+
+
+def models_fingerprint(models: Iterable[Any], extra: Any = None) -> str:
+    """
+    Returns a hash that changes whenever the models, or any model they
+    reference, change their name or the types of their properties, and
+    whenever the enums and `type X = ...` aliases they use change their
+    members or values.
+
+    :param models: The models to fingerprint.
+    :param extra: Anything else the generated code depends on, hashed by its repr.
+    :return: A hex digest.
+    """
+    models = list(models)
+    digest = hashlib.sha256()
+    digest.update(repr(models).encode())
+    used_types = list(models)
+    for model in build_dependency_graph(models).nodes:
+        properties = model_properties(model)
+        digest.update(f"{getattr(model, '__module__', '')}:{model!r}={properties!r};".encode())
+        used_types.extend(properties.values())
+    # their repr is only their name
+    value: Any
+    for py_type in _enums_and_aliases(used_types):
+        if isinstance(py_type, enum.EnumMeta):
+            value = list(py_type.__members__.items())
+        else:
+            value = py_type.__value__
+        digest.update(f"{py_type.__module__}:{py_type!r}={value!r};".encode())
+    digest.update(repr(extra).encode())
+    return digest.hexdigest()
+
+
+def _enums_and_aliases(py_types: Iterable[Any]) -> List[Any]:
+    """
+    Returns the enums and the `type X = ...` aliases the types are made of,
+    without looking inside models.
+    """
+    found: List[Any] = []
+    stack = list(py_types)
+    while stack:
+        current = stack.pop()
+        if isinstance(current, enum.EnumMeta) or _is_type_alias(current):
+            if current in found:
+                continue
+            found.append(current)
+            if _is_type_alias(current):
+                stack.append(current.__value__)
+            continue
+        if get_origin(current) is not Literal:
+            stack.extend(get_args(current))
+    return found
+
+
+class SdkCache:
+    """
+    Thread-safe facade around `generate_typescript_interfaces` and
+    `generate_typescript_function` that keeps the generated code and only
+    generates it again when the models change. Concurrent callers that find
+    it outdated wait for a single generation instead of repeating it.
+
+    The fingerprint of the models is computed again only when the list of
+    models changes, so serving the cached code doesn't inspect them. Call
+    `invalidate` after changing the fields of a model in place.
+
+    :param models: The models to generate interfaces for, or a function that
+                   returns them, called on every render.
+    :param functions: Keyword arguments for `generate_typescript_function`, one
+                      dict per function. `valid_refs` defaults to the models.
+    :param header: Code written before the interfaces, such as imports.
+    :param interface_options: Keyword arguments for `generate_typescript_interfaces`.
+    """
+
+    def __init__(
+        self,
+        models: Union[List[Any], Callable[[], List[Any]]],
+        functions: Sequence[Dict[str, Any]] = (),
+        header: str = "",
+        **interface_options: Any,
+    ) -> None:
+        self._models = models if callable(models) else (lambda: models)
+        self._functions = list(functions)
+        self._header = header
+        self._interface_options = interface_options
+        self._rendered: Optional[RenderedSdk] = None
+        # the last models and their fingerprint, together so threads see both or none
+        self._fingerprinted: Optional[Tuple[Tuple[Any, ...], str]] = None
+        self._lock = threading.Lock()
+
+    def fingerprint(self, models: List[Any]) -> str:
+        """
+        Returns the fingerprint of the models, computed again only when the
+        list of models changes.
+        """
+        fingerprinted = self._fingerprinted
+        if fingerprinted is not None and fingerprinted[0] == tuple(models):
+            return fingerprinted[1]
+        with self._lock:
+            return self._fingerprint(models)
+
+    def _fingerprint(self, models: List[Any]) -> str:
+        # called with the lock held, so concurrent callers compute it once
+        key = tuple(models)
+        fingerprinted = self._fingerprinted
+        if fingerprinted is not None and fingerprinted[0] == key:
+            return fingerprinted[1]
+        # the values of the aliases are types too, which can change
+        aliases = list((self._interface_options.get("type_aliases") or {}).values())
+        fingerprint = models_fingerprint(models + aliases, (self._functions, self._header, self._interface_options))
+        self._fingerprinted = (key, fingerprint)
+        return fingerprint
+
+    def invalidate(self) -> None:
+        """
+        Forget the generated code and the fingerprint of the models, so the
+        next render checks them again.
+        """
+        with self._lock:
+            self._fingerprinted = None
+            self._rendered = None
+
+    def _generate(self, models: List[Any]) -> str:
+        # the functions reference the interfaces by the names they were given
+        symbols = self._interface_options.get("symbols")
+        if symbols is None:
+            symbols = SymbolTable(self._interface_options.get("naming"))
+        code = self._header
+        code += generate_typescript_interfaces(models, **{**self._interface_options, "symbols": symbols})
+        for function in self._functions:
+            code += generate_typescript_function(**{"valid_refs": models, "naming": self._interface_options.get("naming"), "symbols": symbols, **function})
+        return code
+
+    def render(self) -> RenderedSdk:
+        """
+        Returns the generated SDK, generating it first if the models changed.
+        """
+        models = self._models()
+        fingerprinted = self._fingerprinted
+        rendered = self._rendered
+        if (
+            fingerprinted is not None and fingerprinted[0] == tuple(models)
+            and rendered is not None and rendered.fingerprint == fingerprinted[1]
+        ):
+            return rendered
+
+        with self._lock:
+            # another thread may have done it while we waited for the lock
+            fingerprint = self._fingerprint(models)
+            rendered = self._rendered
+            if rendered is not None and rendered.fingerprint == fingerprint:
+                return rendered
+            code = self._generate(models)
+            etag = '"' + hashlib.sha256(code.encode()).hexdigest() + '"'
+            self._rendered = RenderedSdk(code=code, etag=etag, fingerprint=fingerprint)
+            return self._rendered
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _respond(method: str, if_none_match: Optional[str], cache: SdkCache) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    if method not in ("GET", "HEAD"):
+        return 405, [("Allow", "GET, HEAD")], b""
+    rendered = cache.render()
+    headers = [("ETag", rendered.etag), ("Cache-Control", "no-cache")]
+    if _etag_matches(if_none_match, rendered.etag):
+        return 304, headers, b""
+    body = rendered.code.encode()
+    headers += [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))]
+    return 200, headers, body if method == "GET" else b""
+
+
+_REASONS = {200: "OK", 304: "Not Modified", 405: "Method Not Allowed"}
+
+
+def make_wsgi_app(cache: SdkCache) -> Callable[[Dict[str, Any], Callable[..., Any]], List[bytes]]:
+    """
+    Make a WSGI application that serves the SDK with ETag revalidation.
+
+    :param cache: The SDK to serve.
+    :return: The WSGI application.
+    """
+    def app(environ: Dict[str, Any], start_response: Callable[..., Any]) -> List[bytes]:
+        status, headers, body = _respond(environ["REQUEST_METHOD"], environ.get("HTTP_IF_NONE_MATCH"), cache)
+        start_response(f"{status} {_REASONS[status]}", headers)
+        return [body]
+
+    return app
+
+
+def make_asgi_app(cache: SdkCache) -> Callable[..., Coroutine[Any, Any, None]]:
+    """
+    Make an ASGI application that serves the SDK with ETag revalidation.
+    Generation runs in a worker thread so it doesn't block the event loop.
+
+    :param cache: The SDK to serve.
+    :return: The ASGI application.
+    """
+    async def app(scope: Dict[str, Any], receive: Callable[[], Awaitable[Any]], send: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+        request_headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+        status, headers, body = await asyncio.to_thread(_respond, scope["method"], request_headers.get("if-none-match"), cache)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    return app
@@ -0,0 +1,33 @@
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from py_writes_ts.json_values import to_json
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+def _ndjson_line(item: Any) -> bytes:
+    return json.dumps(to_json(item), separators=(",", ":"), ensure_ascii=False).encode() + b"\n"
+
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Encode dataclass instances (or pydantic models, or JSON values) as NDJSON,
+    one line per item, as they are produced. Values are written with
+    `to_json`, so dates, UUIDs and decimals are strings. Use it as the body of a streaming
+    response for the endpoints generated with `Endpoint(stream=True)`, with the
+    `NDJSON_CONTENT_TYPE` content type.
+
+    :param items: The items to send, usually a generator reading them lazily.
+    :return: An iterator of encoded lines.
+    """
+    for item in items:
+        yield _ndjson_line(item)
+
+
+async def ndjson_lines_async(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """
+    Async version of `ndjson_lines`, for ASGI streaming responses.
+    """
+    async for item in items:
+        yield _ndjson_line(item)
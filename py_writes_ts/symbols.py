@@ -0,0 +1,94 @@
+import warnings
+from typing import Any, Dict, Iterator, List, Literal, Optional, Tuple
+
+from py_writes_ts.naming import NamingPolicy
+
+
+class SymbolTable:
+    """
+    The TypeScript name of each python type in a run, decided once and looked
+    up by the type itself afterwards.
+
+    Two different types can want the same name, such as classes with the same
+    name in different modules or `ResponseModel[AB]` and `ResponseModel[A, B]`.
+    The first type to be named keeps it, the next ones get a numeric suffix,
+    like the declarations of a conversion: User, User2, User3... so the names
+    only depend on the order the types are named in, and a warning tells the
+    first time a name is wanted twice. With `on_collision="error"` a
+    ValueError is raised instead.
+
+    :param naming: Naming policy for the preferred names.
+    :param on_collision: "suffix" or "error".
+    """
+
+    def __init__(self, naming: Optional[NamingPolicy] = None, on_collision: Literal["suffix", "error"] = "suffix") -> None:
+        self.naming = naming
+        self.on_collision = on_collision
+        self._names: Dict[Any, str] = {}
+        self._types: Dict[str, Any] = {}
+        self._collisions: Dict[str, List[Any]] = {}
+
+    def name(self, py_type: Any) -> str:
+        """
+        Returns the TypeScript name of a python type, naming it if it is new.
+        """
+        name = self._names.get(py_type)
+        if name is None:
+            name = self._names[py_type] = self._intern(py_type)
+        return name
+
+    def get(self, py_type: Any) -> Optional[str]:
+        """
+        Returns the TypeScript name of a python type if it was named already,
+        None otherwise.
+        """
+        return self._names.get(py_type)
+
+    def _intern(self, py_type: Any) -> str:
+        # imported here, class_to_interface uses this module
+        from py_writes_ts.class_to_interface import ts_name
+
+        preferred = ts_name(py_type, self.naming)
+        name = preferred
+        if name in self._types:
+            other = self._types[name]
+            if self.on_collision == "error":
+                raise ValueError(f"{other!r} and {py_type!r} would both be named '{name}', rename one of them.")
+            # the suffix goes before the type parameters: ResponseModel2<D>
+            base, bracket, params = preferred.partition("<")
+            suffix = 2
+            while name in self._types:
+                name = f"{base}{suffix}{bracket}{params}"
+                suffix += 1
+            if preferred not in self._collisions:
+                warnings.warn(f"{other!r} and {py_type!r} would both be named '{preferred}', so {py_type!r} is named '{name}'. Rename one of them.", stacklevel=2)
+            self._collisions.setdefault(preferred, [other]).append(py_type)
+        self._types[name] = py_type
+        return name
+
+    def type_of(self, name: str) -> Any:
+        """
+        Returns the python type with a TypeScript name.
+
+        :raises KeyError: If no type has that name.
+        """
+        return self._types[name]
+
+    def collisions(self) -> Dict[str, List[Any]]:
+        """
+        Returns the names more than one type wanted, with those types in the
+        order they were named. The first one has the name, the others a suffix.
+        """
+        return {name: list(py_types) for name, py_types in self._collisions.items()}
+
+    def __contains__(self, py_type: Any) -> bool:
+        return py_type in self._names
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the names and their types, in the order they were named.
+        """
+        return iter(self._types.items())
+
+    def __len__(self) -> int:
+        return len(self._types)
@@ -0,0 +1,37 @@
+from types import ModuleType
+from typing import Any, Dict, TypeAlias, get_args, get_origin
+
+from py_writes_ts.class_to_interface import _is_type_alias
+
+
+def _is_alias_annotation(annotation: Any) -> bool:
+    # `from __future__ import annotations` leaves the annotations as strings
+    return annotation is TypeAlias or annotation in ("TypeAlias", "typing.TypeAlias", "typing_extensions.TypeAlias")
+
+
+def find_type_aliases(module: ModuleType) -> Dict[str, Any]:
+    """
+    Find the type aliases of a module, in definition order, ready for the
+    `type_aliases` parameter of `generate_typescript_interfaces`.
+
+    These are type aliases:
+    - `type UserList = list[User]`
+    - `UserList: TypeAlias = List[User]`
+    - `RoomResponse = ResponseModel[Room]`, any module level name, not starting
+      with an underscore, whose value is a parametrized type.
+
+    Aliases made with `type X = ...` are found too, but they don't need to be
+    listed in `type_aliases`: they are declared wherever they are used.
+
+    :param module: The module to search.
+    :return: The aliased types by alias name.
+    """
+    annotations = vars(module).get("__annotations__", {})
+    aliases: Dict[str, Any] = {}
+    for name, value in vars(module).items():
+        if _is_type_alias(value) or _is_alias_annotation(annotations.get(name)):
+            aliases[name] = value
+        elif not name.startswith("_") and get_origin(value) is not None and get_args(value):
+            # bare special forms like `List` have an origin but no arguments
+            aliases[name] = value
+    return aliases
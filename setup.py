@@ -6,5 +6,10 @@ setup(
     install_requires=[
         'setuptools'
     ],
-    packages=find_packages()
+    packages=find_packages(),
+    entry_points={
+        'console_scripts': [
+            'py-writes-ts=py_writes_ts.cli:main',
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,155 @@
+import datetime
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+import pytest
+
+from py_writes_ts.batching import BatchCallError, BatchDispatcher, generate_batching_client
+from py_writes_ts.function_generator import Endpoint
+
+
+@dataclass
+class GetUserByIdRequest:
+    id: int
+
+
+@dataclass
+class GetUserByIdResponse:
+    id: int
+    name: str
+
+
+GET_USER_BY_ID = Endpoint("getUserById", "/api/get_user_by_id", GetUserByIdRequest, GetUserByIdResponse)
+
+
+def test_generate_batching_client() -> None:
+    out = generate_batching_client([GET_USER_BY_ID], valid_refs=[GetUserByIdRequest, GetUserByIdResponse], max_batch_size=20)
+    print(out)
+
+    assert out == """type BatchCall = {
+    endpoint: string;
+    params: unknown;
+    resolve: (data: any) => void;
+    reject: (error: unknown) => void;
+};
+
+type BatchResult = { data: unknown } | { error: string };
+
+let pendingCalls: BatchCall[] = [];
+
+function flushBatch(): void {
+    const calls = pendingCalls;
+    pendingCalls = [];
+    if (calls.length === 0) {
+        return;
+    }
+    fetch(`/api/batch`, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json"
+        },
+        body: JSON.stringify(calls.map(call => ({ endpoint: call.endpoint, params: call.params })))
+    }).then(async response => {
+        if (!response.ok) {
+            throw new Error(`API call failed with status ${response.status}`);
+        }
+        const results: BatchResult[] = await response.json();
+        calls.forEach((call, index) => {
+            const result = results[index];
+            if (result === undefined) {
+                call.reject(new Error("The batch response has no result for this call"));
+            } else if ("error" in result) {
+                call.reject(new Error(result.error));
+            } else {
+                call.resolve(result.data);
+            }
+        });
+    }).catch(error => calls.forEach(call => call.reject(error)));
+}
+
+function batchCall<T>(endpoint: string, params: unknown): Promise<T> {
+    return new Promise<T>((resolve, reject) => {
+        if (pendingCalls.length === 0) {
+            queueMicrotask(flushBatch);
+        }
+        pendingCalls.push({ endpoint, params, resolve, reject });
+        if (pendingCalls.length >= 20) {
+            flushBatch();
+        }
+    });
+}
+
+export function getUserById(
+    params: GetUserByIdRequest
+): Promise<GetUserByIdResponse> {
+    return batchCall<GetUserByIdResponse>("/api/get_user_by_id", params);
+}
+
+"""
+
+
+def test_batch_dispatcher() -> None:
+    dispatcher = BatchDispatcher()
+    users = {1: "Ada", 2: "Grace"}
+
+    @dispatcher.route(GET_USER_BY_ID)
+    def get_user_by_id(request: GetUserByIdRequest) -> GetUserByIdResponse:
+        if request.id == 4:
+            raise BatchCallError("User 4 is private")
+        return GetUserByIdResponse(id=request.id, name=users[request.id])
+
+    results = dispatcher.dispatch([
+        {"endpoint": "/api/get_user_by_id", "params": {"id": 2}},
+        {"endpoint": "/api/get_user_by_id", "params": {"id": 3}},
+        {"endpoint": "/api/get_user_by_id", "params": {"id": 4}},
+        {"endpoint": "/api/missing", "params": {}},
+        {"endpoint": "/api/get_user_by_id", "params": {"id": 1}},
+    ])
+
+    assert results == [
+        {"data": {"id": 2, "name": "Grace"}},
+        # the KeyError is logged, not sent to the client
+        {"error": "Internal error"},
+        {"error": "User 4 is private"},
+        {"error": "Unknown endpoint: /api/missing"},
+        {"data": {"id": 1, "name": "Ada"}},
+    ]
+
+
+def test_handlers_receive_nested_models() -> None:
+    @dataclass
+    class Slot:
+        starts_at: datetime.datetime
+        room: Optional[str]
+
+    @dataclass
+    class BookRequest:
+        slots: List[Slot]
+        first: Optional[Slot]
+
+    received: List[Any] = []
+
+    def book(request: BookRequest) -> int:
+        received.append(request)
+        return 1
+
+    dispatcher = BatchDispatcher()
+    dispatcher.register(Endpoint("book", "/api/book", BookRequest, int), book)
+
+    dispatcher.dispatch([{"endpoint": "/api/book", "params": {
+        "slots": [{"starts_at": "2024-05-01T10:00:00", "room": "A"}],
+        "first": {"starts_at": "2024-05-01T10:00:00", "room": None},
+    }}])
+
+    assert received == [BookRequest(
+        slots=[Slot(datetime.datetime(2024, 5, 1, 10), "A")],
+        first=Slot(datetime.datetime(2024, 5, 1, 10), None),
+    )]
+
+
+def test_batch_dispatcher_rejects_big_batches() -> None:
+    dispatcher = BatchDispatcher(max_batch_size=1)
+    calls: List[dict] = [{"endpoint": "/api/get_user_by_id", "params": {"id": 1}}] * 2
+
+    with pytest.raises(ValueError):
+        dispatcher.dispatch(calls)
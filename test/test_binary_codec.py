@@ -0,0 +1,144 @@
+import base64
+import dataclasses
+import json
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Literal, Optional
+
+import pytest
+
+from py_writes_ts.binary_codec import decode, encode, generate_typescript_decoders
+from py_writes_ts.class_to_interface import generate_typescript_interfaces
+
+
+@dataclass
+class Point:
+    x: float
+    y: float
+
+
+@dataclass
+class Series:
+    name: str
+    kind: Literal["line", "bar"]
+    visible: bool
+    samples: List[float]
+    counts: List[int]
+    points: List[Point]
+    unit: Optional[str] = None
+    origin: Optional[Point] = None
+
+
+@dataclass
+class Category:
+    name: str
+    children: List["Category"]
+
+
+@dataclass
+class Catalog:
+    root: Category
+
+
+def test_round_trip() -> None:
+    series = Series(
+        name="temperatura ñ",
+        kind="bar",
+        visible=True,
+        samples=[0.5, -1.25, 1e300],
+        counts=[1, 2, 3],
+        points=[Point(1, 2), Point(3.5, -4)],
+        origin=Point(0, 0),
+    )
+
+    data = encode(series, Series)
+
+    assert decode(data, Series) == series
+    assert decode(encode([series, series], List[Series]), List[Series]) == [series, series]
+
+
+def test_number_lists_are_aligned() -> None:
+    @dataclass
+    class Samples:
+        flag: bool
+        values: List[float]
+
+    data = encode(Samples(True, [1.0, 2.0]), Samples)
+
+    # flag, count, padding up to 8 bytes, then the values
+    assert len(data) == 1 + 4 + 3 + 16
+    assert data[8:16] == b"\x00\x00\x00\x00\x00\x00\xf0?"
+
+
+def test_unsupported_types() -> None:
+    @dataclass
+    class Unsupported:
+        value: dict
+
+    with pytest.raises(TypeError):
+        encode(Unsupported({}), Unsupported)
+
+
+def test_generate_typescript_decoders() -> None:
+    out = generate_typescript_decoders([Series])
+    print(out)
+
+    assert out.startswith("export type Binary<T> =")
+    assert "export class BinaryReader {" in out
+    assert out.endswith("""export function decodeSeries(reader: BinaryReader): Binary<Series> {
+    return {
+        name: reader.string(),
+        kind: reader.string(),
+        visible: reader.bool(),
+        samples: reader.numbers(),
+        counts: reader.numbers(),
+        points: reader.list(() => ({
+            x: reader.number(),
+            y: reader.number(),
+        })),
+        unit: reader.bool() ? reader.string() : null,
+        origin: reader.bool() ? {
+            x: reader.number(),
+            y: reader.number(),
+        } : null,
+    };
+}
+
+""")
+
+
+def test_decoders_of_classes_that_contain_themselves() -> None:
+    out = generate_typescript_decoders([Catalog, Category])
+
+    assert "    return {\n        root: decodeCategory(reader),\n    };" in out
+    assert "        children: reader.list(() => decodeCategory(reader)),\n" in out
+    with pytest.raises(ValueError, match=r"Category references itself \(Category -> Category\)"):
+        generate_typescript_decoders([Catalog])
+
+
+@pytest.mark.skipif(shutil.which("deno") is None, reason="needs deno to run the TypeScript decoders")
+def test_typescript_decoders_read_the_python_encoding(tmp_path: Path) -> None:
+    series = Series(
+        name="temperatura ñ",
+        kind="line",
+        visible=False,
+        samples=[0.5, -1.25, 1e300],
+        counts=[1, 2, 3],
+        points=[Point(1, 2), Point(3.5, -4)],
+        unit="°C",
+    )
+    data = base64.b64encode(encode([series, series], List[Series])).decode()
+    script = tmp_path / "decode.ts"
+    script.write_text(generate_typescript_interfaces([Point, Series]) + generate_typescript_decoders([Point, Series]) + f"""
+const bytes = Uint8Array.from(atob("{data}"), char => char.charCodeAt(0));
+const reader = new BinaryReader(bytes);
+const series: Binary<Series>[] = reader.list(() => decodeSeries(reader));
+console.log(JSON.stringify(series, (key, value) => value instanceof Float64Array ? Array.from(value) : value));
+""", encoding="utf-8")
+
+    # --check type checks the decoders against the interfaces before running them
+    result = subprocess.run(["deno", "run", "--check", str(script)], capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout) == [dataclasses.asdict(series)] * 2
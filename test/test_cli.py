@@ -0,0 +1,197 @@
+import importlib
+import json
+import os
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from py_writes_ts.cli import main, resolve_type
+from py_writes_ts.manifest import export_manifest
+
+
+def write_project(tmp_path: Path, module_name: str, config: str) -> Path:
+    (tmp_path / f"{module_name}.py").write_text(textwrap.dedent("""
+        from dataclasses import dataclass
+        from typing import Generic, List, Optional, TypeVar
+
+        D = TypeVar("D")
+
+        @dataclass
+        class User:
+            id: int
+            name: str
+
+        @dataclass
+        class GetUserByIdRequest:
+            id: int
+
+        @dataclass
+        class ResponseModel(Generic[D]):
+            success: bool
+            data: Optional[D] = None
+
+        @dataclass
+        class Unused:
+            value: str
+    """))
+    config_path = tmp_path / "py-writes-ts.toml"
+    config_path.write_text(textwrap.dedent(config).replace("MODULE", module_name))
+    return config_path
+
+
+def test_generates_outputs_from_config(tmp_path: Path, capsys: Any) -> None:
+    config_path = write_project(tmp_path, "cli_models_basic", """
+        [[outputs]]
+        path = "sdk/api.ts"
+        models = ["MODULE", "MODULE:ResponseModel[MODULE:User]"]
+        renames = { "MODULE:User" = "UserDto" }
+        prune = true
+
+        [[outputs.endpoints]]
+        name = "getUserById"
+        path = "/api/get_user_by_id"
+        request = "MODULE:GetUserByIdRequest"
+        response = "MODULE:ResponseModel[MODULE:User]"
+    """)
+
+    assert main(["-c", str(config_path), "--timings"]) == 0
+
+    code = (tmp_path / "sdk" / "api.ts").read_text()
+    print(code)
+    assert code.startswith("""export interface UserDto {
+    id: number;
+    name: string;
+}
+
+export interface GetUserByIdRequest {
+    id: number;
+}
+
+export interface UserDtoResponseModel {
+    success: boolean;
+    data: UserDto | null;
+}
+export async function getUserById(
+    params: GetUserByIdRequest
+): Promise<UserDtoResponseModel> {
+""")
+    assert "Unused" not in code
+    assert "sdk/api.ts  written" in capsys.readouterr().out
+
+
+def test_cache_and_write_if_changed(tmp_path: Path, capsys: Any) -> None:
+    config_path = write_project(tmp_path, "cli_models_cache", """
+        write_if_changed = true
+
+        [[outputs]]
+        path = "users.ts"
+        models = ["MODULE:User"]
+
+        [[outputs]]
+        path = "requests.ts"
+        models = ["MODULE:GetUserByIdRequest"]
+    """)
+    output = tmp_path / "users.ts"
+
+    main(["-c", str(config_path), "--cache", "--jobs", "2"])
+    assert (tmp_path / ".py-writes-ts-cache.json").exists()
+    assert (tmp_path / "requests.ts").read_text() == "export interface GetUserByIdRequest {\n    id: number;\n}\n"
+    os.utime(output, (0, 0))
+
+    main(["-c", str(config_path), "--cache", "--timings"])
+    assert "users.ts     cached" in capsys.readouterr().out
+
+    main(["-c", str(config_path), "--timings"])
+    assert "users.ts     unchanged" in capsys.readouterr().out
+    assert output.stat().st_mtime == 0
+
+    main(["-c", str(config_path), "--no-write-if-changed"])
+    assert output.stat().st_mtime != 0
+
+
+def test_generates_outputs_from_a_manifest(tmp_path: Path) -> None:
+    endpoint = """
+        [[outputs.endpoints]]
+        name = "getUserById"
+        path = "/api/get_user_by_id"
+        request = "MODULE:GetUserByIdRequest"
+        response = "MODULE:ResponseModel[MODULE:User]"
+    """
+    config_path = write_project(tmp_path, "cli_models_manifest", """
+        [[outputs]]
+        path = "from_models.ts"
+        models = ["MODULE", "MODULE:ResponseModel[MODULE:User]"]
+    """ + endpoint + """
+        [[outputs]]
+        path = "from_manifest.ts"
+        manifest = "types.json"
+    """ + endpoint)
+
+    # the manifest is exported in the backend, the rest runs without it
+    sys.path.insert(0, str(tmp_path))
+    try:
+        module = importlib.import_module("cli_models_manifest")
+        manifest = export_manifest([module.User, module.GetUserByIdRequest, module.Unused, module.ResponseModel[module.User]])
+    finally:
+        sys.path.remove(str(tmp_path))
+    (tmp_path / "types.json").write_text(json.dumps(manifest))
+
+    assert main(["-c", str(config_path)]) == 0
+
+    assert (tmp_path / "from_manifest.ts").read_text() == (tmp_path / "from_models.ts").read_text()
+
+
+def test_functions_use_the_names_of_colliding_interfaces(tmp_path: Path) -> None:
+    config_path = write_project(tmp_path, "cli_models_collisions", """
+        [[outputs]]
+        path = "api.ts"
+        models = ["MODULE:User", "cli_models_other_users:User"]
+
+        [[outputs.endpoints]]
+        name = "getOtherUser"
+        path = "/api/get_other_user"
+        request = "MODULE:GetUserByIdRequest"
+        response = "cli_models_other_users:User"
+    """)
+    (tmp_path / "cli_models_other_users.py").write_text(textwrap.dedent("""
+        from dataclasses import dataclass
+
+        @dataclass
+        class User:
+            email: str
+    """))
+
+    with pytest.warns(UserWarning, match="would both be named 'User'"):
+        assert main(["-c", str(config_path)]) == 0
+
+    code = (tmp_path / "api.ts").read_text()
+    print(code)
+    assert "export interface User2 {\n    email: string;\n}" in code
+    assert "): Promise<User2> {" in code
+
+
+def test_type_only_outputs_cant_have_endpoints(tmp_path: Path) -> None:
+    config_path = write_project(tmp_path, "cli_models_type_only", """
+        [[outputs]]
+        path = "types.ts"
+        models = ["MODULE"]
+        type_only = true
+
+        [[outputs.endpoints]]
+        name = "getUserById"
+        path = "/api/get_user_by_id"
+        request = "MODULE:GetUserByIdRequest"
+        response = "MODULE:User"
+    """)
+
+    with pytest.raises(ValueError, match="type only"):
+        main(["-c", str(config_path)])
+    assert not (tmp_path / "types.ts").exists()
+
+
+def test_resolve_type_errors() -> None:
+    with pytest.raises(ValueError):
+        resolve_type("collections")
@@ -0,0 +1,231 @@
+import datetime
+import decimal
+import enum
+import uuid
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple, TypedDict
+
+import pytest
+
+from py_writes_ts.class_to_interface import (
+    ConversionContext,
+    generate_typescript_interfaces,
+    get_converter,
+    py_type_to_ts_string,
+    register_converter,
+    unregister_converter,
+)
+from py_writes_ts.dependency_graph import is_model
+
+
+def test_standard_library_types() -> None:
+    @dataclass
+    class Event:
+        id: uuid.UUID
+        created_at: datetime.datetime
+        day: datetime.date
+        at: datetime.time
+        price: decimal.Decimal
+        payload: bytes
+
+    out = py_type_to_ts_string(Event, [])
+    print(out)
+
+    assert out == """{
+    id: string;
+    created_at: string;
+    day: string;
+    at: string;
+    price: string;
+    payload: string;
+}"""
+
+
+def test_collections() -> None:
+    @dataclass
+    class Data:
+        tags: Set[str]
+        frozen: FrozenSet[int]
+        seq: Sequence[float]
+        pair: Tuple[int, str]
+        many: Tuple[int, ...]
+        empty: Tuple[()]
+        scores: Dict[str, float]
+        lookup: Mapping[int, List[str]]
+        bare_list: list
+        bare_dict: dict
+        builtin_generic: dict[str, list[int]]
+        pipe_union: int | None
+
+    out = py_type_to_ts_string(Data, [])
+    print(out)
+
+    assert out == """{
+    tags: string[];
+    frozen: number[];
+    seq: number[];
+    pair: [number, string];
+    many: number[];
+    empty: [];
+    scores: Record<string, number>;
+    lookup: Record<number, string[]>;
+    bare_list: any[];
+    bare_dict: Record<string, any>;
+    builtin_generic: Record<string, number[]>;
+    pipe_union: number | null;
+}"""
+
+
+def test_enum_and_annotated() -> None:
+    class Color(enum.Enum):
+        RED = "red"
+        GREEN = "green"
+
+    class Level(enum.IntEnum):
+        LOW = 1
+        HIGH = 2
+
+    class Mode(str, enum.Enum):
+        FAST = "fast"
+
+    @dataclass
+    class Data:
+        color: Color
+        level: Level
+        mode: Mode
+        size: Annotated[int, "metadata"]
+
+    out = py_type_to_ts_string(Data, [])
+    print(out)
+
+    assert out == """{
+    color: 'red' | 'green';
+    level: 1 | 2;
+    mode: 'fast';
+    size: number;
+}"""
+
+
+def test_register_custom_converter() -> None:
+    class Money:
+        pass
+
+    class Euros(Money):
+        pass
+
+    @register_converter(Money)
+    def money_to_ts(py_type: Any, context: ConversionContext, indent: int) -> str:
+        return "`${number} EUR`"
+
+    try:
+        @dataclass
+        class Wallet:
+            balance: Money
+            savings: Optional[Euros]
+
+        out = generate_typescript_interfaces([Wallet])
+    finally:
+        unregister_converter(Money)
+
+    print(out)
+
+    assert out == """export interface Wallet {
+    balance: `${number} EUR`;
+    savings: `${number} EUR` | null;
+}
+"""
+
+
+def test_custom_converter_for_generic_origin() -> None:
+    @dataclass
+    class Room:
+        name: str
+
+    def set_to_ts(py_type: Any, context: ConversionContext, indent: int) -> str:
+        (item_type,) = py_type.__args__
+        return f"Set<{context.convert(item_type, indent)}>"
+
+    previous = get_converter(Set[Room])
+    register_converter(set, set_to_ts)
+    try:
+        out = py_type_to_ts_string(Set[Room], ["Room"])
+    finally:
+        register_converter(set, previous)
+
+    assert out == "Set<Room>"
+    assert py_type_to_ts_string(Set[Room], ["Room"]) == "Room[]"
+
+
+def test_registering_a_base_updates_resolved_subclasses() -> None:
+    class Money:
+        pass
+
+    class Euros(Money):
+        pass
+
+    def money_to_ts(py_type: Any, context: ConversionContext, indent: int) -> str:
+        return "number"
+
+    assert get_converter(Euros) is None
+    register_converter(Money, money_to_ts)
+    try:
+        assert get_converter(Euros) is money_to_ts
+    finally:
+        unregister_converter(Money)
+    assert get_converter(Euros) is None
+
+
+class Point(NamedTuple):
+    x: int
+    y: int
+
+
+class Options(TypedDict):
+    name: str
+    tags: List[str]
+
+
+@dataclass
+class Scores(Mapping[str, int]):
+    owner: str
+
+    def __getitem__(self, key: str) -> int:
+        return 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+
+def test_containers_with_properties_are_interfaces() -> None:
+    class Names(List[str]):
+        pass
+
+    assert all(is_model(py_type) for py_type in [Point, Options, Scores])
+    assert not is_model(Names)
+
+    out = generate_typescript_interfaces([Point, Options, Scores])
+    print(out)
+
+    assert out == """export interface Point {
+    x: number;
+    y: number;
+}
+
+export interface Options {
+    name: string;
+    tags: string[];
+}
+
+export interface Scores {
+    owner: string;
+}
+"""
+    assert py_type_to_ts_string(Names, []) == "any[]"
+
+
+def test_unregister_unknown_converter() -> None:
+    with pytest.raises(KeyError):
+        unregister_converter(object())
@@ -0,0 +1,136 @@
+import dataclasses
+import sys
+from types import FrameType
+from typing import Any, Generic, List, Optional, TypeVar, get_args
+
+import pytest
+
+from py_writes_ts.class_to_interface import ConversionContext, ConverterSteps, generate_typescript_interfaces, py_type_to_ts_string, register_converter, unregister_converter
+
+T = TypeVar("T")
+
+# deeper than python would allow a recursive converter to go
+DEPTH = 5 * sys.getrecursionlimit()
+
+
+def test_deeply_nested_lists() -> None:
+    # types.GenericAlias: the typing module's cache would hash the whole nesting
+    py_type: Any = int
+    for _ in range(DEPTH):
+        py_type = list[py_type]
+
+    assert py_type_to_ts_string(py_type, []) == "number" + "[]" * DEPTH
+
+
+def test_deeply_nested_dicts_tuples_and_unions() -> None:
+    py_type: Any = str
+    expected = "string"
+    for _ in range(DEPTH):
+        py_type = dict[str, tuple[py_type, int]] | None
+        expected = f"Record<string, [{expected}, number]> | null"
+
+    assert py_type_to_ts_string(py_type, []) == expected
+
+
+def test_deeply_nested_inline_classes() -> None:
+    # every level indents the levels inside it, so the output grows fast:
+    # go past the recursion limit by lowering it instead
+    depth = 300
+    py_type: Any = int
+    for level in range(depth):
+        py_type = dataclasses.make_dataclass(f"Level{level}", [("child", py_type)])
+    expected = "number"
+    for level in reversed(range(1, depth + 1)):
+        expected = f"{{\n{'    ' * level}child: {expected};\n{'    ' * (level - 1)}}}"
+
+    frames = 0
+    frame: Optional[FrameType] = sys._getframe()
+    while frame is not None:
+        frames += 1
+        frame = frame.f_back
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(frames + 100)
+    try:
+        out = py_type_to_ts_string(py_type, [])
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert out == expected
+
+
+@dataclasses.dataclass
+class Node:
+    children: List["Node"]
+
+
+@dataclasses.dataclass
+class Tree:
+    root: Node
+
+
+@dataclasses.dataclass
+class Employee:
+    team: Optional["Team"]
+
+
+@dataclasses.dataclass
+class Team:
+    lead: Employee
+
+
+def test_classes_that_contain_themselves() -> None:
+    assert generate_typescript_interfaces([Tree, Node]) == """export interface Tree {
+    root: Node;
+}
+
+export interface Node {
+    children: Node[];
+}
+"""
+
+    # without an interface they would be written inline forever
+    with pytest.raises(ValueError, match=r"Node references itself \(Node -> Node\)"):
+        generate_typescript_interfaces([Tree])
+    with pytest.raises(ValueError, match=r"Employee references itself \(Employee -> Team -> Employee\)"):
+        py_type_to_ts_string(Employee, [])
+
+
+@dataclasses.dataclass
+class Box(Generic[T]):
+    pass
+
+
+class Unsupported:
+    pass
+
+
+def convert_unsupported(py_type: Any, context: ConversionContext, indent: int) -> str:
+    raise ValueError("Unsupported can't be converted.")
+
+
+def test_generator_converters() -> None:
+    def convert_box(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+        item = yield get_args(py_type)[0], indent
+        return f"Box<{item}>"
+
+    def convert_box_or_unknown(py_type: Any, context: ConversionContext, indent: int) -> ConverterSteps:
+        # errors of the nested types are raised at the yield
+        try:
+            item = yield get_args(py_type)[0], indent
+        except ValueError:
+            return "unknown"
+        return f"Box<{item}>"
+
+    register_converter(Box, convert_box)
+    register_converter(Unsupported, convert_unsupported)
+    try:
+        assert py_type_to_ts_string(Box[list[int]], []) == "Box<number[]>"
+        assert py_type_to_ts_string(list[Box[int]], []) == "Box<number>[]"
+
+        register_converter(Box, convert_box_or_unknown)
+        assert py_type_to_ts_string(list[Box[Unsupported]], []) == "unknown[]"
+        with pytest.raises(ValueError):
+            py_type_to_ts_string(list[Unsupported], [])
+    finally:
+        unregister_converter(Box)
+        unregister_converter(Unsupported)
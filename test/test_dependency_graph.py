@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Literal, Optional, TypeVar
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces
+from py_writes_ts.dependency_graph import build_dependency_graph, reachable_models, referenced_models
+
+D = TypeVar("D")
+
+
+@dataclass
+class Exit:
+    name: str
+    destination_room_id: str
+
+
+@dataclass
+class Room:
+    id: str
+    exits: List[Exit]
+    neighbours: Dict[str, "Room"]
+
+
+@dataclass
+class ResponseModel(Generic[D]):
+    success: bool
+    data: Optional[D] = None
+
+
+@dataclass
+class GetRoomRequest:
+    id: str
+
+
+@dataclass
+class User:
+    name: str
+    kind: Literal["admin", "player"]
+
+
+@dataclass
+class GetUserRequest:
+    id: str
+
+
+def test_referenced_models() -> None:
+    assert referenced_models(Dict[str, List[Room]]) == [Room]
+    assert referenced_models(Optional[ResponseModel[Exit]]) == [ResponseModel[Exit]]
+    assert referenced_models(Literal["Room"]) == []
+
+
+def test_edges_and_reverse_edges() -> None:
+    graph = build_dependency_graph([ResponseModel[Room]])
+
+    assert graph.nodes == [ResponseModel[Room], Room, Exit]
+    assert graph.dependencies(ResponseModel[Room]) == [Room]
+    assert graph.dependencies(Room) == [Exit, Room]
+    assert graph.dependencies(Exit) == []
+    assert graph.dependents(Room) == [ResponseModel[Room], Room]
+    assert graph.dependents(Exit) == [Room]
+
+
+def test_topological_order() -> None:
+    graph = build_dependency_graph([ResponseModel[Room], GetRoomRequest])
+
+    assert graph.topological_order() == [Exit, Room, ResponseModel[Room], GetRoomRequest]
+
+
+def test_reachable_models() -> None:
+    models = [GetRoomRequest, ResponseModel[Room], Room, Exit, GetUserRequest, ResponseModel[User], User]
+
+    assert reachable_models(models, [GetRoomRequest, ResponseModel[Room]]) == [GetRoomRequest, ResponseModel[Room], Room, Exit]
+    assert reachable_models(models, [List[User]]) == [User]
+
+
+def test_generate_only_reachable_interfaces() -> None:
+    models = [GetUserRequest, ResponseModel[User], User, GetRoomRequest, Room, Exit]
+
+    out = generate_typescript_interfaces(models, reachable_from=[GetUserRequest, ResponseModel[User]])
+    print(out)
+
+    assert out == """export interface GetUserRequest {
+    id: string;
+}
+
+export interface UserResponseModel {
+    success: boolean;
+    data: User | null;
+}
+
+export interface User {
+    name: string;
+    kind: 'admin' | 'player';
+}
+"""
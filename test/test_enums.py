@@ -0,0 +1,112 @@
+import enum
+from dataclasses import dataclass
+from typing import List, Literal, Optional
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces, py_type_to_ts_string
+from py_writes_ts.function_generator import generate_typescript_function
+from py_writes_ts.naming import NamingPolicy
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class Priority(enum.IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+@dataclass
+class Task:
+    color: Color
+    priority: Priority
+    history: List[Priority]
+    background: Optional[Color] = None
+
+
+def test_enums_inline_without_declarations() -> None:
+    assert py_type_to_ts_string(Color, []) == "'red' | 'green'"
+    assert py_type_to_ts_string(Literal[Color.GREEN], []) == "'green'"
+
+
+def test_declared_enums_are_referenced_by_name() -> None:
+    out = generate_typescript_function("paint", {"color": Color}, None, "return;", valid_refs=[Color])
+
+    assert out == """export function paint(
+    color: Color
+): void {
+    return;
+}
+
+"""
+
+
+def test_enums_as_unions() -> None:
+    out = generate_typescript_interfaces([Task])
+    print(out)
+
+    assert out == """export type Color = 'red' | 'green';
+
+export type Priority = 1 | 2;
+
+export interface Task {
+    color: Color;
+    priority: Priority;
+    history: Priority[];
+    background: Color | null;
+}
+"""
+
+
+def test_enums_as_const_enums() -> None:
+    out = generate_typescript_interfaces([Task], enum_style="const_enum", naming=NamingPolicy(renames={Priority: "TaskPriority"}))
+    print(out)
+
+    assert out == """export const enum Color {
+    RED = 'red',
+    GREEN = 'green',
+}
+
+export const enum TaskPriority {
+    LOW = 1,
+    HIGH = 2,
+}
+
+export interface Task {
+    color: Color;
+    priority: TaskPriority;
+    history: TaskPriority[];
+    background: Color | null;
+}
+"""
+
+
+def test_enums_as_const_objects() -> None:
+    class Status(str, enum.Enum):
+        OPEN = "open"
+        CLOSED = "closed"
+
+    out = generate_typescript_interfaces([Status], enum_style="const_object")
+    print(out)
+
+    assert out == """export const Status = {
+    OPEN: 'open',
+    CLOSED: 'closed',
+} as const;
+export type Status = typeof Status[keyof typeof Status];
+"""
+
+
+def test_enums_with_other_values_cant_be_const_enums() -> None:
+    class Pair(enum.Enum):
+        A = (1, 2)
+
+    @dataclass
+    class Data:
+        pair: Pair
+
+    with pytest.raises(ValueError):
+        generate_typescript_interfaces([Data], enum_style="const_enum")
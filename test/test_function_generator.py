@@ -1,5 +1,5 @@
-from typing import Generic, Optional, TypeVar
-from py_writes_ts.function_generator import generate_typescript_function
+from typing import Generic, List, Optional, TypeVar
+from py_writes_ts.function_generator import Endpoint, EndpointCache, generate_client_runtime, generate_endpoint_function, generate_endpoint_table, generate_typescript_function
 from dataclasses import dataclass
 
 
@@ -134,4 +134,190 @@ return b
     return b
 }
 
-"""
\ No newline at end of file
+"""
+
+def test_generate_endpoint_function() -> None:
+    @dataclass
+    class GetUserByIdRequest:
+        id: int
+
+    @dataclass
+    class GetUserByIdResponse:
+        id: int
+        name: str
+
+    out = generate_endpoint_function(
+        Endpoint("getUserById", "/api/get_user_by_id", GetUserByIdRequest, GetUserByIdResponse),
+        valid_refs=[GetUserByIdRequest, GetUserByIdResponse],
+    )
+    print(out)
+    assert out == """export async function getUserById(
+    params: GetUserByIdRequest
+): Promise<GetUserByIdResponse> {
+    const response = await fetch(`/api/get_user_by_id`, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json"
+        },
+        body: JSON.stringify(params)
+    });
+    
+    if (!response.ok) {
+        throw new Error(`API call failed with status ${response.status}`);
+    }
+    
+    const data: GetUserByIdResponse = await response.json();
+    return data;
+}
+
+"""
+
+
+def test_get_endpoints_send_their_parameters_in_the_query_string() -> None:
+    @dataclass
+    class SearchUsersRequest:
+        name: str
+        page: int
+
+    out = generate_endpoint_function(
+        Endpoint("searchUsers", "/api/search_users", SearchUsersRequest, List[int], method="GET"),
+        valid_refs=[SearchUsersRequest],
+    )
+    print(out)
+    assert out == """export async function searchUsers(
+    params: SearchUsersRequest
+): Promise<number[]> {
+    const response = await fetch(`/api/search_users?${new URLSearchParams(Object.entries(params as {}).map(([name, value]) => [name, String(value)]))}`, {
+        method: "GET",
+        headers: {
+            "Content-Type": "application/json"
+        }
+    });
+    
+    if (!response.ok) {
+        throw new Error(`API call failed with status ${response.status}`);
+    }
+    
+    const data: number[] = await response.json();
+    return data;
+}
+
+"""
+
+
+def test_generate_cached_endpoint_function() -> None:
+    @dataclass
+    class SearchUsersRequest:
+        name: str
+        page: int
+
+    @dataclass
+    class SearchUsersResponse:
+        ids: List[int]
+
+    out = generate_endpoint_function(
+        Endpoint(
+            "searchUsers", "/api/search_users", SearchUsersRequest, SearchUsersResponse,
+            cache=EndpointCache(ttl_ms=30000, max_entries=50, etag=True),
+        ),
+        valid_refs=[SearchUsersRequest, SearchUsersResponse],
+    )
+    print(out)
+    assert out == """export async function searchUsers(
+    params: SearchUsersRequest
+): Promise<SearchUsersResponse> {
+    return cachedRequest<SearchUsersResponse>(`/api/search_users`, "POST", params, JSON.stringify([params.name, params.page]), 30000, 50, true);
+}
+
+"""
+
+
+def test_client_runtime_is_shared() -> None:
+    runtime = generate_client_runtime()
+
+    assert runtime.startswith("interface CacheEntry {")
+    assert "export async function cachedRequest<T>(" in runtime
+    assert runtime.count("inFlightRequests.set(") == 1
+    # GET and HEAD requests can't have a body
+    assert "body: bodyless ? undefined : JSON.stringify(params)" in runtime
+
+
+def test_generate_endpoint_table() -> None:
+    @dataclass
+    class GetUserByIdRequest:
+        id: int
+
+    @dataclass
+    class GetUserByIdResponse:
+        id: int
+        name: str
+
+    out = generate_endpoint_table(
+        [
+            Endpoint("getUserById", "/api/get_user_by_id", GetUserByIdRequest, GetUserByIdResponse),
+            Endpoint("getUserIds", "/api/get_user_ids", GetUserByIdRequest, List[int], method="GET"),
+        ],
+        valid_refs=[GetUserByIdRequest, GetUserByIdResponse],
+    )
+    print(out)
+    assert out == """export interface Api {
+    getUserById: [GetUserByIdRequest, GetUserByIdResponse];
+    getUserIds: [GetUserByIdRequest, number[]];
+}
+
+// path and method
+type Route = [string, string];
+
+const routes: Record<keyof Api, Route> = {
+    getUserById: [`/api/get_user_by_id`, "POST"],
+    getUserIds: [`/api/get_user_ids`, "GET"],
+};
+
+export async function call<K extends keyof Api>(endpoint: K, params: Api[K][0]): Promise<Api[K][1]> {
+    const [path, method] = routes[endpoint];
+    const bodyless = method === "GET" || method === "HEAD";
+    const response = await fetch(bodyless ? `${path}?${new URLSearchParams(Object.entries(params as {}).map(([name, value]) => [name, String(value)]))}` : path, {
+        method,
+        headers: {
+            "Content-Type": "application/json"
+        },
+        body: bodyless ? undefined : JSON.stringify(params)
+    });
+
+    if (!response.ok) {
+        throw new Error(`API call failed with status ${response.status}`);
+    }
+
+    return await response.json();
+}
+
+export const getUserById = (params: Api["getUserById"][0]) => call("getUserById", params);
+export const getUserIds = (params: Api["getUserIds"][0]) => call("getUserIds", params);
+
+"""
+
+
+def test_endpoint_table_with_cached_endpoints_and_no_wrappers() -> None:
+    out = generate_endpoint_table(
+        [Endpoint("search", "/api/search", str, List[str], cache=EndpointCache(ttl_ms=1000, etag=True))],
+        wrappers=False,
+    )
+
+    assert "    search: [`/api/search`, \"POST\", [(params) => JSON.stringify(params), 1000, 100, true]],\n" in out
+    assert "return cachedRequest<Api[K][1]>(path, method, params, key(params), ...options);" in out
+    assert out.endswith("    return await response.json();\n}\n\n")
+
+
+def test_endpoint_table_keys_cached_models_by_their_fields() -> None:
+    @dataclass
+    class SearchUsersRequest:
+        name: str
+        page: int
+
+    out = generate_endpoint_table(
+        [Endpoint("searchUsers", "/api/search_users", SearchUsersRequest, List[int], cache=EndpointCache(ttl_ms=1000))],
+        valid_refs=[SearchUsersRequest],
+    )
+
+    # the same key as generate_endpoint_function
+    assert "    searchUsers: [`/api/search_users`, \"POST\", [(params) => JSON.stringify([params.name, params.page]), 1000, 100, false]],\n" in out
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces
+from py_writes_ts.import_generator import generate_typescript_export, generate_typescript_import, generate_typescript_type_import
+from py_writes_ts.naming import NamingPolicy
+
+T = TypeVar("T")
+
+
+@dataclass
+class User:
+    name: str
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+
+
+def test_value_import() -> None:
+    assert generate_typescript_import("socket.io-client", ["io", "Socket"]) == "import { io, Socket } from 'socket.io-client';\n"
+
+
+def test_type_only_import() -> None:
+    assert generate_typescript_import("./models", ["User", "Room"], type_only=True) == "import type { User, Room } from './models';\n"
+    assert generate_typescript_import("./models", ["User"], type_names=["User"]) == "import type { User } from './models';\n"
+
+
+def test_mixed_import() -> None:
+    out = generate_typescript_import("socket.io-client", ["io", "Socket"], type_names=["Socket"])
+
+    assert out == "import { io, type Socket } from 'socket.io-client';\n"
+
+
+def test_type_import_of_python_types() -> None:
+    out = generate_typescript_type_import("./models", [User, Page[User], Page], naming=NamingPolicy(prefix="I"))
+
+    assert out == "import type { IUser, IUserPage, IPage } from './models';\n"
+
+
+def test_type_only_export() -> None:
+    assert generate_typescript_export("./models", ["User"], type_only=True) == "export type { User } from './models';\n"
+    assert generate_typescript_export("./client", ["getUser"]) == "export { getUser } from './client';\n"
+    with pytest.raises(ValueError):
+        generate_typescript_export("./models", [])
+
+
+def test_type_only_interfaces_reject_value_declarations() -> None:
+    assert generate_typescript_interfaces([User], type_only=True) == "export interface User {\n    name: string;\n}\n"
+    with pytest.raises(ValueError):
+        generate_typescript_interfaces([User], type_only=True, enum_style="const_enum")
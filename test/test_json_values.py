@@ -0,0 +1,56 @@
+import datetime
+import decimal
+import enum
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from py_writes_ts.json_values import from_json, to_json
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@dataclass
+class Line:
+    price: decimal.Decimal
+    color: Color
+
+
+@dataclass
+class Order:
+    id: uuid.UUID
+    placed_at: datetime.datetime
+    due: Optional[datetime.date]
+    lines: List[Line]
+    totals: Dict[str, decimal.Decimal]
+    window: Tuple[datetime.time, datetime.time]
+
+
+ORDER = Order(
+    id=uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    placed_at=datetime.datetime(2024, 5, 1, 10, 30),
+    due=None,
+    lines=[Line(decimal.Decimal("9.99"), Color.RED)],
+    totals={"EUR": decimal.Decimal("9.99")},
+    window=(datetime.time(9), datetime.time(17, 30)),
+)
+
+ORDER_JSON = {
+    "id": "12345678-1234-5678-1234-567812345678",
+    "placed_at": "2024-05-01T10:30:00",
+    "due": None,
+    "lines": [{"price": "9.99", "color": "red"}],
+    "totals": {"EUR": "9.99"},
+    "window": ["09:00:00", "17:30:00"],
+}
+
+
+def test_to_json() -> None:
+    assert to_json(ORDER) == ORDER_JSON
+
+
+def test_from_json() -> None:
+    assert from_json(Order, ORDER_JSON) == ORDER
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from typing import List, Literal, Optional
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces, py_type_to_ts_string
+
+CountryCode = Literal['US', 'CA', 'ES', 'FR']
+
+
+def test_string_literals_are_escaped() -> None:
+    out = py_type_to_ts_string(Literal["it's", 'say "hi"', "back\\slash", "new\nline"], [])
+    print(out)
+
+    assert out == """'it\\'s' | 'say "hi"' | 'back\\\\slash' | 'new\\nline'"""
+
+
+def test_small_literals_stay_inline() -> None:
+    @dataclass
+    class Address:
+        country: CountryCode
+
+    out = generate_typescript_interfaces([Address], literal_alias_threshold=5)
+    print(out)
+
+    assert out == """export interface Address {
+    country: 'US' | 'CA' | 'ES' | 'FR';
+}
+"""
+
+
+def test_large_literals_are_declared_once() -> None:
+    @dataclass
+    class Address:
+        country_code: CountryCode
+        street: str
+
+    @dataclass
+    class Company:
+        countries: List[CountryCode]
+        headquarters: Address
+        hq_country: Optional[CountryCode]
+
+    out = generate_typescript_interfaces([Company], literal_alias_threshold=4)
+    print(out)
+
+    assert out == """export type CompanyCountries = 'US' | 'CA' | 'ES' | 'FR';
+
+export interface Company {
+    countries: CompanyCountries[];
+    headquarters: {
+        country_code: CompanyCountries;
+        street: string;
+    };
+    hq_country: CompanyCountries | null;
+}
+"""
+
+
+def test_large_literals_as_const_array_with_explicit_name() -> None:
+    @dataclass
+    class Address:
+        country: CountryCode
+
+    @dataclass
+    class Invoice:
+        billing_country: CountryCode
+        status: Literal['draft', 'sent', 'paid', 'void']
+
+    out = generate_typescript_interfaces(
+        [Address, Invoice],
+        literal_alias_threshold=4,
+        literal_style="const_array",
+        literal_names={CountryCode: "CountryCode"},
+    )
+    print(out)
+
+    assert out == """export const CountryCodeValues = ['US', 'CA', 'ES', 'FR'] as const;
+export type CountryCode = typeof CountryCodeValues[number];
+
+export const InvoiceStatusValues = ['draft', 'sent', 'paid', 'void'] as const;
+export type InvoiceStatus = typeof InvoiceStatusValues[number];
+
+export interface Address {
+    country: CountryCode;
+}
+
+export interface Invoice {
+    billing_country: CountryCode;
+    status: InvoiceStatus;
+}
+"""
+
+
+def test_declared_literals_dont_take_interface_names() -> None:
+    @dataclass
+    class InvoiceStatus:
+        code: str
+
+    @dataclass
+    class Invoice:
+        status: Literal['draft', 'sent']
+        s2: InvoiceStatus
+
+    out = generate_typescript_interfaces([Invoice, InvoiceStatus], literal_alias_threshold=2)
+    print(out)
+
+    assert out == """export type InvoiceStatus2 = 'draft' | 'sent';
+
+export interface Invoice {
+    status: InvoiceStatus2;
+    s2: InvoiceStatus;
+}
+
+export interface InvoiceStatus {
+    code: string;
+}
+"""
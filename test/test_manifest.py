@@ -0,0 +1,100 @@
+import datetime
+import enum
+import json
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, Generic, List, Literal, Optional, Tuple, TypeVar
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces, register_converter, unregister_converter
+from py_writes_ts.manifest import export_manifest, load_manifest, render_manifest
+from py_writes_ts.naming import NamingPolicy
+
+D = TypeVar("D")
+
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class Money:
+    pass
+
+
+@dataclass
+class Room:
+    name: str
+    color: Color
+    opened_at: Optional[datetime.datetime]
+
+
+@dataclass
+class ResponseModel(Generic[D]):
+    success: bool
+    data: Optional[D] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class Hotel:
+    rooms: Dict[str, Room]
+    position: Tuple[float, float]
+    tags: Tuple[str, ...]
+    status: Literal["open", "closed", Color.RED]
+    size: Annotated[int, "m2"]
+    price: Money
+    anything: Any
+    response: ResponseModel[List[Room]]
+
+
+def _round_trip(py_types: List[Any], **options: Any) -> None:
+    manifest = json.loads(json.dumps(export_manifest(py_types, options.get("type_aliases"))))
+    expected = generate_typescript_interfaces(py_types, **options)
+    print(expected)
+    assert render_manifest(manifest, **{key: value for key, value in options.items() if key != "type_aliases"}) == expected
+
+
+@pytest.fixture
+def money_converter():
+    register_converter(Money, lambda py_type, context, indent: "`${number} ${string}`")
+    yield
+    unregister_converter(Money)
+
+
+def test_manifest_describes_the_models() -> None:
+    manifest = export_manifest([ResponseModel[Room]])
+
+    assert manifest["types"] == [{"ref": f"{__name__}:ResponseModel", "args": [{"ref": f"{__name__}:Room"}]}]
+    assert manifest["models"][f"{__name__}:ResponseModel"] == {
+        "kind": "class",
+        "name": "ResponseModel",
+        "params": ["D"],
+        "fields": {
+            "success": "bool",
+            "data": {"origin": "Union", "args": [{"typevar": "D"}, "None"]},
+            "error": {"origin": "Union", "args": ["str", "None"]},
+        },
+    }
+    assert manifest["models"][f"{__name__}:Color"] == {"kind": "enum", "name": "Color", "members": [["RED", "red"], ["GREEN", "green"]]}
+
+
+def test_manifest_renders_the_same_interfaces(money_converter: None) -> None:
+    _round_trip([Room, ResponseModel[Room], Hotel])
+    _round_trip([ResponseModel])
+    _round_trip([Hotel], enum_style="const_enum", literal_alias_threshold=2)
+    _round_trip([Room, Hotel], type_aliases={"RoomResponse": ResponseModel[List[Room]]})
+
+
+def test_manifest_types_can_be_renamed() -> None:
+    loaded = load_manifest(json.loads(json.dumps(export_manifest([Room]))))
+    naming = NamingPolicy(renames={loaded.models[f"{__name__}:Room"]: "RoomDto"})
+
+    assert generate_typescript_interfaces(loaded.types, naming=naming) == generate_typescript_interfaces(
+        [Room], naming=NamingPolicy(renames={Room: "RoomDto"})
+    )
+
+
+def test_manifest_version_is_checked() -> None:
+    with pytest.raises(ValueError):
+        load_manifest({"version": 0, "models": {}, "types": [], "aliases": {}})
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import Generic, List, Optional, TypeVar
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces, ts_name
+from py_writes_ts.function_generator import generate_typescript_function
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+
+D = TypeVar("D")
+E = TypeVar("E")
+
+
+@dataclass
+class User:
+    name: str
+
+
+@dataclass
+class Room:
+    id: str
+
+
+@dataclass
+class ResponseModel(Generic[D]):
+    success: bool
+    data: Optional[D] = None
+
+
+@dataclass
+class Pair(Generic[D, E]):
+    first: D
+    second: E
+
+
+def test_policy_names() -> None:
+    naming = NamingPolicy(renames={User: "UserDto"}, prefix="I", suffix="Model")
+
+    assert ts_name(User, naming) == "UserDto"
+    assert ts_name(Room, naming) == "IRoomModel"
+    assert ts_name(ResponseModel[User], naming) == "IUserDtoResponseModelModel"
+    assert ts_name(Pair[Room, User], naming) == "IRoomUserDtoPairModel"
+    assert ts_name(ResponseModel, naming) == "IResponseModelModel<D>"
+
+
+def test_renamed_generic_class_and_args_after() -> None:
+    naming = NamingPolicy(renames={ResponseModel: "Response", ResponseModel[Room]: "RoomResult"}, generic_args="after")
+
+    assert ts_name(ResponseModel[User], naming) == "ResponseUser"
+    assert ts_name(ResponseModel[Room], naming) == "RoomResult"
+    assert ts_name(ResponseModel, naming) == "Response<D>"
+
+
+def test_interfaces_use_the_policy() -> None:
+    @dataclass
+    class Lobby:
+        rooms: List[Room]
+        owner: ResponseModel[User]
+
+    naming = NamingPolicy(renames={User: "UserDto"}, prefix="I")
+    out = generate_typescript_interfaces([Lobby, Room, ResponseModel[User], User], naming=naming)
+    print(out)
+
+    assert out == """export interface ILobby {
+    rooms: IRoom[];
+    owner: IUserDtoResponseModel;
+}
+
+export interface IRoom {
+    id: string;
+}
+
+export interface IUserDtoResponseModel {
+    success: boolean;
+    data: UserDto | null;
+}
+
+export interface UserDto {
+    name: string;
+}
+"""
+
+
+def test_functions_use_the_policy_without_touching_the_body() -> None:
+    naming = NamingPolicy(renames={User: "UserDto"})
+    out = generate_typescript_function(
+        function_name="getUser",
+        parameters={"params": User},
+        return_type=ResponseModel[User],
+        valid_refs=[User, ResponseModel[User]],
+        body="return { User: 'User' };",
+        naming=naming,
+    )
+    print(out)
+
+    assert out == """export function getUser(
+    params: UserDto
+): UserDtoResponseModel {
+    return { User: 'User' };
+}
+
+"""
+
+
+def test_name_collisions() -> None:
+    naming = NamingPolicy(renames={Room: "User"})
+
+    with pytest.warns(UserWarning, match="would both be named 'User'"):
+        out = generate_typescript_interfaces([User, Room], naming=naming)
+    assert "export interface User {" in out
+    assert "export interface User2 {" in out
+
+    with pytest.raises(ValueError, match="would both be named 'User'"):
+        generate_typescript_interfaces([User, Room], naming=naming, symbols=SymbolTable(naming, on_collision="error"))
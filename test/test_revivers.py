@@ -0,0 +1,132 @@
+import datetime
+import decimal
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces
+from py_writes_ts.revivers import Reviver, generate_typescript_revivers, reviver_ts_types
+
+
+@dataclass
+class User:
+    name: str
+    birthday: Optional[datetime.date]
+
+
+@dataclass
+class Tag:
+    name: str
+
+
+@dataclass
+class Slot:
+    starts_at: datetime.datetime
+    price: decimal.Decimal
+
+
+@dataclass
+class Event:
+    title: str
+    created_at: datetime.datetime
+    attendees: List[User]
+    tags: List[Tag]
+    slots: List[Slot]
+    history: Dict[str, List[datetime.datetime]]
+    window: Tuple[datetime.datetime, int]
+
+
+@dataclass
+class Comment:
+    posted_at: datetime.datetime
+    replies: List["Comment"]
+
+
+@dataclass
+class Thread:
+    first: Comment
+
+
+def test_interfaces_use_the_revived_types() -> None:
+    out = generate_typescript_interfaces([User, Slot], ts_types=reviver_ts_types())
+
+    assert out == """export interface User {
+    name: string;
+    birthday: Date | null;
+}
+
+export interface Slot {
+    starts_at: Date;
+    price: string;
+}
+"""
+
+
+def test_revivers_only_touch_what_needs_it() -> None:
+    out = generate_typescript_revivers([User, Tag, Event])
+    print(out)
+
+    assert out == """export function reviveUser(data: any): User {
+    if (data.birthday != null) {
+        data.birthday = new Date(data.birthday);
+    }
+    return data;
+}
+
+export function reviveEvent(data: any): Event {
+    data.created_at = new Date(data.created_at);
+    for (let i0 = 0; i0 < data.attendees.length; i0++) {
+        reviveUser(data.attendees[i0]);
+    }
+    for (let i0 = 0; i0 < data.slots.length; i0++) {
+        data.slots[i0].starts_at = new Date(data.slots[i0].starts_at);
+    }
+    for (const k0 in data.history) {
+        for (let i1 = 0; i1 < data.history[k0].length; i1++) {
+            data.history[k0][i1] = new Date(data.history[k0][i1]);
+        }
+    }
+    data.window[0] = new Date(data.window[0]);
+    return data;
+}
+"""
+
+
+def test_custom_revivers() -> None:
+    out = generate_typescript_revivers([Slot], revivers={decimal.Decimal: Reviver("Big", "new Big({value})")})
+
+    assert out == """export function reviveSlot(data: any): Slot {
+    data.price = new Big(data.price);
+    return data;
+}
+"""
+
+
+def test_ambiguous_unions_are_rejected() -> None:
+    @dataclass
+    class Deadline:
+        at: Union[datetime.datetime, int]
+
+    with pytest.raises(ValueError):
+        generate_typescript_revivers([Deadline])
+
+
+def test_classes_that_contain_themselves() -> None:
+    out = generate_typescript_revivers([Thread, Comment])
+
+    assert out == """export function reviveThread(data: any): Thread {
+    reviveComment(data.first);
+    return data;
+}
+
+export function reviveComment(data: any): Comment {
+    data.posted_at = new Date(data.posted_at);
+    for (let i0 = 0; i0 < data.replies.length; i0++) {
+        reviveComment(data.replies[i0]);
+    }
+    return data;
+}
+"""
+    with pytest.raises(ValueError, match=r"Comment references itself \(Comment -> Comment\)"):
+        generate_typescript_revivers([Thread])
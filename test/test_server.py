@@ -0,0 +1,160 @@
+import asyncio
+import enum
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Literal
+
+import pytest
+
+import py_writes_ts.server
+from py_writes_ts.server import SdkCache, make_asgi_app, make_wsgi_app, models_fingerprint
+
+
+@dataclass
+class GetUserByIdRequest:
+    id: int
+
+
+@dataclass
+class GetUserByIdResponse:
+    id: int
+    name: str
+
+
+FUNCTIONS = [{
+    "function_name": "getUserById",
+    "parameters": {"params": GetUserByIdRequest},
+    "return_type": "Promise<GetUserByIdResponse>",
+    "body": "return fetch('/api/get_user_by_id').then(r => r.json());",
+    "is_async": True,
+}]
+
+
+def test_render_is_cached_until_models_change() -> None:
+    models: List[Any] = [GetUserByIdRequest]
+    cache = SdkCache(lambda: models, functions=FUNCTIONS)
+
+    first = cache.render()
+    assert cache.render() is first
+    assert first.etag.startswith('"') and first.etag.endswith('"')
+    assert "params: GetUserByIdRequest" in first.code
+
+    models.append(GetUserByIdResponse)
+    second = cache.render()
+    assert second is not first
+    assert second.etag != first.etag
+    assert "export interface GetUserByIdResponse" in second.code
+
+
+def test_concurrent_renders_generate_once(monkeypatch: Any) -> None:
+    calls = []
+    fingerprint_calls = []
+    generate = py_writes_ts.server.generate_typescript_interfaces
+    fingerprint = py_writes_ts.server.models_fingerprint
+
+    def slow_generate(*args: Any, **kwargs: Any) -> str:
+        calls.append(1)
+        time.sleep(0.05)
+        return generate(*args, **kwargs)
+
+    def slow_fingerprint(*args: Any, **kwargs: Any) -> str:
+        fingerprint_calls.append(1)
+        time.sleep(0.05)
+        return fingerprint(*args, **kwargs)
+
+    monkeypatch.setattr(py_writes_ts.server, "generate_typescript_interfaces", slow_generate)
+    monkeypatch.setattr(py_writes_ts.server, "models_fingerprint", slow_fingerprint)
+    cache = SdkCache([GetUserByIdRequest, GetUserByIdResponse])
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.render())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(fingerprint_calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_wsgi_app() -> None:
+    cache = SdkCache([GetUserByIdRequest, GetUserByIdResponse], functions=FUNCTIONS)
+    app = make_wsgi_app(cache)
+    responses: List[Any] = []
+
+    def start_response(status: str, headers: List[Any]) -> None:
+        responses.append((status, dict(headers)))
+
+    body = app({"REQUEST_METHOD": "GET"}, start_response)
+    status, headers = responses[-1]
+    assert status == "200 OK"
+    assert headers["Content-Type"] == "application/typescript; charset=utf-8"
+    assert b"".join(body).decode() == cache.render().code
+
+    body = app({"REQUEST_METHOD": "GET", "HTTP_IF_NONE_MATCH": headers["ETag"]}, start_response)
+    assert responses[-1][0] == "304 Not Modified"
+    assert body == [b""]
+
+    app({"REQUEST_METHOD": "POST"}, start_response)
+    assert responses[-1][0] == "405 Method Not Allowed"
+
+
+def test_asgi_app() -> None:
+    cache = SdkCache([GetUserByIdRequest])
+    app = make_asgi_app(cache)
+    sent: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+
+    asyncio.run(app({"type": "http", "method": "GET", "headers": []}, receive, send))
+    assert sent[0]["status"] == 200
+    assert sent[1]["body"] == cache.render().code.encode()
+
+    etag = dict(sent[0]["headers"])[b"etag"]
+    asyncio.run(app({"type": "http", "method": "GET", "headers": [(b"if-none-match", b"W/" + etag)]}, receive, send))
+    assert sent[2]["status"] == 304
+
+
+def test_cached_renders_dont_inspect_the_models(monkeypatch: Any) -> None:
+    calls = []
+    fingerprint = py_writes_ts.server.models_fingerprint
+
+    def counted_fingerprint(*args: Any, **kwargs: Any) -> str:
+        calls.append(1)
+        return fingerprint(*args, **kwargs)
+
+    monkeypatch.setattr(py_writes_ts.server, "models_fingerprint", counted_fingerprint)
+    cache = SdkCache(lambda: [GetUserByIdRequest, GetUserByIdResponse])
+    first = cache.render()
+    assert cache.render() is first
+    assert len(calls) == 1
+
+    cache.invalidate()
+    assert cache.render() is not first
+    assert len(calls) == 2
+
+
+def test_fingerprint_changes_with_enum_members_and_alias_values() -> None:
+    TypeAliasType = pytest.importorskip("typing_extensions").TypeAliasType
+
+    def make_models(color: str, status: Any) -> List[Any]:
+        # same names and reprs, only the values change
+        Color = enum.Enum("Color", {"RED": color})
+        Status = TypeAliasType("Status", status)
+
+        @dataclass
+        class Paint:
+            color: Color  # type: ignore[valid-type]
+            status: List[Status]  # type: ignore[valid-type]
+
+        return [Paint]
+
+    fingerprint = models_fingerprint(make_models("red", Literal["open"]))
+    assert models_fingerprint(make_models("red", Literal["open"])) == fingerprint
+    assert models_fingerprint(make_models("rouge", Literal["open"])) != fingerprint
+    assert models_fingerprint(make_models("red", Literal["closed"])) != fingerprint
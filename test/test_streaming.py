@@ -0,0 +1,117 @@
+import asyncio
+import datetime
+import decimal
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+import pytest
+
+from py_writes_ts.function_generator import Endpoint, generate_endpoint_function, stream_item_type
+from py_writes_ts.streaming import ndjson_lines, ndjson_lines_async
+
+
+@dataclass
+class GetAllUsersRequest:
+    pass
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+
+
+@dataclass
+class GetAllUsersResponse:
+    users: List[User]
+
+
+def test_stream_item_type() -> None:
+    assert stream_item_type(List[User]) == User
+    assert stream_item_type(GetAllUsersResponse) == User
+    with pytest.raises(ValueError):
+        stream_item_type(User)
+
+
+def test_generate_streaming_endpoint_function() -> None:
+    out = generate_endpoint_function(
+        Endpoint("getAllUsers", "/api/get_users", GetAllUsersRequest, GetAllUsersResponse, stream=True),
+        valid_refs=[GetAllUsersRequest, User, GetAllUsersResponse],
+    )
+    print(out)
+
+    assert out == """export async function* getAllUsers(
+    params: GetAllUsersRequest
+): AsyncGenerator<User, void, undefined> {
+    const response = await fetch(`/api/get_users`, {
+        method: "POST",
+        headers: {
+            "Content-Type": "application/json",
+            "Accept": "application/x-ndjson"
+        },
+        body: JSON.stringify(params)
+    });
+    
+    if (!response.ok || response.body === null) {
+        throw new Error(`API call failed with status ${response.status}`);
+    }
+    
+    // parse each line as soon as it is complete
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += value;
+        const lines = buffer.split("\\n");
+        buffer = lines.pop()!;
+        for (const line of lines) {
+            if (line.trim() !== "") {
+                const item: User = JSON.parse(line);
+                yield item;
+            }
+        }
+    }
+    if (buffer.trim() !== "") {
+        const item: User = JSON.parse(buffer);
+        yield item;
+    }
+}
+
+"""
+
+
+def test_ndjson_lines() -> None:
+    def read_users():
+        yield User(1, "Ada")
+        yield User(2, "Grace\nHopper")
+
+    lines = list(ndjson_lines(read_users()))
+
+    assert lines == [b'{"id":1,"name":"Ada"}\n', b'{"id":2,"name":"Grace\\nHopper"}\n']
+    assert [json.loads(line) for line in lines][1] == {"id": 2, "name": "Grace\nHopper"}
+
+
+def test_ndjson_lines_async() -> None:
+    async def read_users() -> AsyncIterator[User]:
+        for i in range(3):
+            yield User(i, f"user {i}")
+
+    async def collect() -> List[bytes]:
+        return [line async for line in ndjson_lines_async(read_users())]
+
+    assert asyncio.run(collect())[2] == b'{"id":2,"name":"user 2"}\n'
+
+
+def test_ndjson_lines_write_dates_as_strings() -> None:
+    @dataclass
+    class Event:
+        at: datetime.datetime
+        price: decimal.Decimal
+
+    lines = list(ndjson_lines([Event(datetime.datetime(2024, 5, 1), decimal.Decimal("1.50"))]))
+
+    assert lines == [b'{"at":"2024-05-01T00:00:00","price":"1.50"}\n']
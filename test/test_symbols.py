@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import Generic, List, Optional, TypeVar
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces
+from py_writes_ts.function_generator import generate_typescript_function
+from py_writes_ts.naming import NamingPolicy
+from py_writes_ts.symbols import SymbolTable
+
+D = TypeVar("D")
+
+
+@dataclass
+class User:
+    name: str
+
+
+class other:
+    # classes with the same names, from another module
+
+    @dataclass
+    class User:
+        id: int
+
+    @dataclass
+    class ResponseModel(Generic[D]):
+        data: D
+
+
+OtherUser = other.User
+
+
+@dataclass
+class ResponseModel(Generic[D]):
+    success: bool
+    data: Optional[D] = None
+
+
+@dataclass
+class Profile:
+    user: User
+    other: OtherUser
+
+
+def test_names_are_interned() -> None:
+    symbols = SymbolTable(NamingPolicy(suffix="Dto"))
+
+    assert symbols.name(ResponseModel[User]) == "UserResponseModelDto"
+    assert symbols.name(ResponseModel[User]) == "UserResponseModelDto"
+    assert symbols.name(ResponseModel) == "ResponseModelDto<D>"
+    assert symbols.type_of("UserResponseModelDto") == ResponseModel[User]
+    assert ResponseModel[User] in symbols
+    assert len(symbols) == 2
+    assert symbols.collisions() == {}
+
+
+def test_collisions_get_a_suffix() -> None:
+    symbols = SymbolTable()
+
+    with pytest.warns(UserWarning) as warnings:
+        assert [symbols.name(t) for t in (User, OtherUser, ResponseModel[User], ResponseModel[OtherUser])] == [
+            "User", "User2", "UserResponseModel", "UserResponseModel2",
+        ]
+    assert [str(warning.message).split(", so")[0] for warning in warnings] == [
+        f"{User!r} and {OtherUser!r} would both be named 'User'",
+        f"{ResponseModel[User]!r} and {ResponseModel[OtherUser]!r} would both be named 'UserResponseModel'",
+    ]
+    assert symbols.type_of("User2") is OtherUser
+    assert symbols.collisions() == {
+        "User": [User, OtherUser],
+        "UserResponseModel": [ResponseModel[User], ResponseModel[OtherUser]],
+    }
+    assert list(symbols) == [
+        ("User", User),
+        ("User2", OtherUser),
+        ("UserResponseModel", ResponseModel[User]),
+        ("UserResponseModel2", ResponseModel[OtherUser]),
+    ]
+
+
+def test_suffix_goes_before_the_type_parameters() -> None:
+    symbols = SymbolTable()
+    symbols.name(ResponseModel)
+
+    with pytest.warns(UserWarning):
+        assert symbols.name(other.ResponseModel) == "ResponseModel2<D>"
+
+
+def test_interfaces_with_colliding_names() -> None:
+    with pytest.raises(ValueError, match="would both be named 'User'"):
+        generate_typescript_interfaces([User, OtherUser, Profile], symbols=SymbolTable(on_collision="error"))
+
+    symbols = SymbolTable()
+    with pytest.warns(UserWarning, match="would both be named 'User'"):
+        out = generate_typescript_interfaces([User, OtherUser, Profile], symbols=symbols)
+    print(out)
+
+    assert out == """export interface User {
+    name: string;
+}
+
+export interface User2 {
+    id: number;
+}
+
+export interface Profile {
+    user: User;
+    other: User2;
+}
+"""
+    assert symbols.type_of("User2") is OtherUser
+
+
+def test_inline_classes_are_not_named() -> None:
+    def make_data() -> type:
+        @dataclass
+        class Data:
+            value: int
+        return Data
+
+    @dataclass
+    class Data:
+        name: str
+
+    @dataclass
+    class Outer:
+        first: Data
+        second: make_data()  # type: ignore[valid-type]
+
+    symbols = SymbolTable()
+    out = generate_typescript_interfaces([Outer], symbols=symbols)
+    print(out)
+
+    assert out == """export interface Outer {
+    first: {
+        name: string;
+    };
+    second: {
+        value: number;
+    };
+}
+"""
+    assert list(symbols) == [("Outer", Outer)]
+
+
+def test_functions_use_the_names_of_the_interfaces() -> None:
+    symbols = SymbolTable()
+    with pytest.warns(UserWarning):
+        interfaces = generate_typescript_interfaces([User, OtherUser], symbols=symbols)
+    function = generate_typescript_function("getUser", {"id": int}, OtherUser, "return fetchUser(id);", valid_refs=[User, OtherUser], symbols=symbols)
+
+    assert "export interface User2 {" in interfaces
+    assert "): User2 {" in function
@@ -0,0 +1,169 @@
+import sys
+from dataclasses import dataclass
+from typing import Generic, List, Literal, Optional, TypeAlias, TypeVar, Union
+
+import pytest
+
+from py_writes_ts.class_to_interface import generate_typescript_interfaces, py_type_to_ts_string
+from py_writes_ts.dependency_graph import reachable_models
+from py_writes_ts.type_aliases import find_type_aliases
+
+TypeAliasType = pytest.importorskip("typing_extensions").TypeAliasType
+
+D = TypeVar("D")
+
+
+@dataclass
+class Room:
+    name: str
+
+
+@dataclass
+class ResponseModel(Generic[D]):
+    success: bool
+    data: Optional[D] = None
+
+
+RoomResponse = ResponseModel[Room]
+RoomList: TypeAlias = List[Room]
+Status = Literal["open", "closed", "locked"]
+Payload = TypeAliasType("Payload", Union[Room, List[Room], None])
+
+
+@dataclass
+class Hotel:
+    rooms: RoomList
+    status: Status
+    backup_status: Optional[Status]
+    # made at runtime, mypy only knows the aliases it can see statically
+    payload: Payload  # type: ignore[valid-type]
+
+
+@dataclass
+class Booking:
+    response: RoomResponse
+    previous: List[RoomResponse]
+
+
+def test_find_type_aliases() -> None:
+    aliases = find_type_aliases(sys.modules[__name__])
+
+    assert aliases == {
+        "RoomResponse": RoomResponse,
+        "RoomList": RoomList,
+        "Status": Status,
+        "Payload": Payload,
+    }
+
+
+def test_aliases_are_declared_once() -> None:
+    out = generate_typescript_interfaces(
+        [Room, Hotel],
+        type_aliases={"RoomList": RoomList, "Status": Status},
+    )
+    print(out)
+
+    assert out == """export type RoomList = Room[];
+
+export type Status = 'open' | 'closed' | 'locked';
+
+export type Payload = Room | RoomList | null;
+
+export interface Room {
+    name: string;
+}
+
+export interface Hotel {
+    rooms: RoomList;
+    status: Status;
+    backup_status: Status | null;
+    payload: Payload;
+}
+"""
+
+
+def test_alias_of_a_named_literal() -> None:
+    @dataclass
+    class Door:
+        status: Status
+
+    # the alias is the literal type, not an alias of another declaration
+    out = generate_typescript_interfaces([Door], literal_alias_threshold=2, type_aliases={"Status": Status})
+    assert out == """export type Status = 'open' | 'closed' | 'locked';
+
+export interface Door {
+    status: Status;
+}
+"""
+
+    out = generate_typescript_interfaces([Door], literal_alias_threshold=2, literal_style="const_array", type_aliases={"Status": Status})
+    assert out == """export const StatusValues = ['open', 'closed', 'locked'] as const;
+export type Status = typeof StatusValues[number];
+
+export interface Door {
+    status: Status;
+}
+"""
+
+
+def test_alias_of_an_interface() -> None:
+    out = generate_typescript_interfaces(
+        [Room, ResponseModel[Room], Booking],
+        type_aliases={"RoomResponse": RoomResponse},
+    )
+    print(out)
+
+    assert out == """export type RoomResponse = RoomResponseModel;
+
+export interface Room {
+    name: string;
+}
+
+export interface RoomResponseModel {
+    success: boolean;
+    data: Room | null;
+}
+
+export interface Booking {
+    response: RoomResponse;
+    previous: RoomResponse[];
+}
+"""
+
+
+def test_alias_of_an_inline_type() -> None:
+    out = generate_typescript_interfaces([Booking], type_aliases={"RoomResponse": RoomResponse})
+    print(out)
+
+    assert out == """export type RoomResponse = {
+    success: boolean;
+    data: {
+        name: string;
+    } | null;
+};
+
+export interface Booking {
+    response: RoomResponse;
+    previous: RoomResponse[];
+}
+"""
+
+
+def test_type_alias_types_in_py_types_are_declared() -> None:
+    out = generate_typescript_interfaces([Payload])
+
+    assert out == """export type Payload = {
+    name: string;
+} | {
+    name: string;
+}[] | null;
+"""
+
+
+def test_type_alias_types_are_inlined_without_declarations() -> None:
+    assert py_type_to_ts_string(Payload, ["Room"]) == "Room | Room[] | null"
+    assert py_type_to_ts_string(Payload, ["Payload"]) == "Payload"
+
+
+def test_type_alias_types_are_followed_by_the_dependency_graph() -> None:
+    assert reachable_models([Room, Hotel], [Payload]) == [Room]